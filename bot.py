@@ -7,7 +7,13 @@ from telegram.ext import (
     MessageHandler,
     filters,
 )
-from resume_parser import fetch_resumes
+from query_plan import InvalidQueryError, parse_range, parse_salary_range
+from resume_parser import (
+    ScrapingError,
+    SiteUnavailableError,
+    fetch_resumes,
+    get_metrics,
+)
 
 from config import TELEGRAM_TOKEN
 
@@ -20,6 +26,13 @@ from config import TELEGRAM_TOKEN
     ENTERING_SALARY,
 ) = range(5)
 
+# Site names shown to the user
+SITE_NAMES = {
+    "work_ua": "Work.ua",
+    "robota_ua": "Robota.ua",
+    "all": "Work.ua and Robota.ua",
+}
+
 
 # Start command
 async def start(update, context):
@@ -67,7 +80,8 @@ async def handle_experience(update, context):
         context.user_data["experience"] = None
     else:
         try:
-            # Handle case where the experience is entered as a number or range (e.g., "2-5 years")
+            # Handle case where the experience is entered as a number or range (e.g., "2-5", "5+")
+            parse_range(experience_input)
             context.user_data["experience"] = experience_input
         except ValueError:
             await update.message.reply_text(
@@ -91,6 +105,13 @@ async def handle_salary(update, context):
     if salary_input == "-":
         context.user_data["salary"] = None
     else:
+        try:
+            parse_salary_range(salary_input)
+        except ValueError:
+            await update.message.reply_text(
+                "Invalid salary range, please enter a value like 20000 or 20000-50000."
+            )
+            return ENTERING_SALARY
         context.user_data["salary"] = salary_input
 
     site = context.user_data.get("site")
@@ -108,24 +129,49 @@ async def handle_salary(update, context):
             location=location,
             experience=experience,
             salary=salary,
+            enrich_top=5,
         )
 
+        # Tell the user which site the results are missing from
+        for site_name in resumes.site_errors:
+            await update.message.reply_text(
+                f"{SITE_NAMES[site_name]} could not be searched right now, "
+                "showing results from the other site only."
+            )
+
         if resumes:
             for resume in resumes[:5]:
+                details = resume.get("details") or {}
+                skills = ", ".join(details.get("skills", [])[:10])
                 await update.message.reply_text(
                     f"Title: {resume['title']}\n"
                     f"Salary: {resume['salary']}\n"
                     f"Personal Info: {resume['personal_info']}\n"
                     f"Location: {resume['location']}\n"
-                    f"Link: {resume['link']}\n"
+                    + (f"Skills: {skills}\n" if skills else "")
+                    + f"Link: {resume['link']}\n"
                     f"Score: {resume['score']}\n"
                 )
         else:
             await update.message.reply_text("No resumes found.")
 
+    except InvalidQueryError as e:
+        await update.message.reply_text(f"{e}. Use /start to search again.")
+    except SiteUnavailableError:
+        await update.message.reply_text(
+            f"{SITE_NAMES[site]} is temporarily unavailable, please try again later."
+        )
+    except ScrapingError as e:
+        # The error text contains URLs and browser details, keep it in the log
+        print(f"Error while fetching resumes: {e}")
+        await update.message.reply_text(
+            f"Unable to load resumes from {SITE_NAMES[site]} right now, "
+            "please try again later."
+        )
     except Exception as e:
+        print(f"Error occurred while fetching resumes: {e}")
         await update.message.reply_text(
-            f"Error occurred while fetching resumes: {str(e)}"
+            "Error occurred while fetching resumes, please try again later."
         )
 
     return ConversationHandler.END
@@ -136,6 +182,21 @@ async def help_command(update, context):
     await update.message.reply_text("Use /start to begin.")
 
 
+# Status command
+async def status_command(update, context):
+    metrics = get_metrics()
+    lines = [
+        f"Driver failures: {metrics['driver_failures']}",
+        f"Driver restarts: {metrics['driver_restarts']}",
+    ]
+    for site, breaker in metrics["circuit_breakers"].items():
+        lines.append(
+            f"{site}: {breaker['state']} "
+            f"(failures: {breaker['total_failures']}, rejected: {breaker['total_rejected']})"
+        )
+    await update.message.reply_text("\n".join(lines))
+
+
 # Define the conversation handler
 def main():
     # Initialize the Application object with the provided token
@@ -164,6 +225,7 @@ def main():
 
     # Add the conversation handler to the application
     application.add_handler(conversation_handler)
+    application.add_handler(CommandHandler("status", status_command))
 
     # Start polling for updates
     application.run_polling()
@@ -0,0 +1,359 @@
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from resume_parser import fetch_resumes
+
+
+FIELDS = [
+    "query_id",
+    "site",
+    "query",
+    "title",
+    "salary",
+    "personal_info",
+    "location",
+    "link",
+    "score",
+    "details",
+]
+
+SITES = ["work_ua", "robota_ua", "all"]
+
+
+def load_queries(path, default_site):
+    """
+    Reads search queries from a file, one query per line.
+
+    A line is either a JSON object with the fetch_resumes arguments
+    (e.g. {"site": "work_ua", "job_position": "Python Developer", "salary": "20000-50000"})
+    or a plain job position searched on the default site.
+
+    Invalid lines are reported and yielded with a None query, so one bad line
+    does not stop the export.
+
+    :param path: Path to the queries file.
+    :param default_site: Site used when a query does not specify one.
+    :return: Generator of (query_id, query) tuples, query_id being the line number.
+    """
+    with open(path, encoding="utf-8") as f:
+        for line_number, line in enumerate(f, start=1):
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            try:
+                query = _parse_query(line, default_site)
+            except ValueError as e:
+                print(f"Line {line_number}: invalid query: {e}", file=sys.stderr)
+                query = None
+            yield line_number, query
+
+
+def _parse_query(line, default_site):
+    if not line.startswith("{"):
+        return {"job_position": line, "site": default_site}
+
+    query = json.loads(line)
+    if not isinstance(query, dict) or not query.get("job_position"):
+        raise ValueError("expected a JSON object with a job_position")
+    query.setdefault("site", default_site)
+    if query["site"] not in SITES:
+        raise ValueError(f"unknown site {query['site']!r}, expected one of {SITES}")
+    return query
+
+
+def load_checkpoint(path):
+    """
+    Reads the checkpoint file written by a previous run.
+
+    :param path: Path to the checkpoint file.
+    :return: Tuple (set of completed query IDs, output offset after the last completed query).
+    """
+    completed = set()
+    offset = 0
+    if not os.path.exists(path):
+        return completed, offset
+
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                # The last line may be cut off by a crash
+                break
+            completed.add(entry["query_id"])
+            offset = entry.get("offset", offset)
+    return completed, offset
+
+
+class JsonlWriter:
+    def __init__(self, path, offset, resume=False):
+        self.file = _open_at_offset(path, offset)
+
+    def write(self, rows):
+        for row in rows:
+            self.file.write(json.dumps(row, ensure_ascii=False) + "\n")
+        return _sync(self.file)
+
+    def close(self):
+        self.file.close()
+
+
+class CsvWriter:
+    def __init__(self, path, offset, resume=False):
+        self.file = _open_at_offset(path, offset)
+        self.writer = csv.DictWriter(self.file, fieldnames=FIELDS)
+        if offset == 0:
+            self.writer.writeheader()
+
+    def write(self, rows):
+        for row in rows:
+            if row.get("details") is not None:
+                row = {**row, "details": json.dumps(row["details"], ensure_ascii=False)}
+            self.writer.writerow(row)
+        return _sync(self.file)
+
+    def close(self):
+        self.file.close()
+
+
+class ParquetWriter:
+    """
+    Writes every completed query as its own file inside a dataset directory.
+
+    A Parquet file is only readable once its footer is written, so each part
+    is written to a temporary file and renamed when complete.
+    """
+
+    def __init__(self, path, offset, resume=False):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise SystemExit(
+                "Parquet export requires pyarrow. Install it with: pip install pyarrow"
+            )
+
+        self.pa = pa
+        self.pq = pq
+        self.path = path
+        self.schema = pa.schema(
+            [
+                (field, pa.int64() if field in ("query_id", "score") else pa.string())
+                for field in FIELDS
+            ]
+        )
+        os.makedirs(path, exist_ok=True)
+
+        # Parts of an earlier export would mix into a fresh one, and temporary
+        # files are left over from a crash mid-write
+        for name in os.listdir(path):
+            stale = name.endswith(".parquet.tmp") or (
+                not resume and name.startswith("part-") and name.endswith(".parquet")
+            )
+            if stale:
+                os.remove(os.path.join(path, name))
+
+    def write(self, rows):
+        if not rows:
+            return 0
+        rows = [
+            {
+                **row,
+                "details": json.dumps(row["details"], ensure_ascii=False)
+                if row.get("details") is not None
+                else None,
+            }
+            for row in rows
+        ]
+        part = os.path.join(self.path, f"part-{rows[0]['query_id']:06d}.parquet")
+        table = self.pa.Table.from_pylist(rows, schema=self.schema)
+        self.pq.write_table(table, part + ".tmp")
+        os.replace(part + ".tmp", part)
+        return 0
+
+    def close(self):
+        pass
+
+
+WRITERS = {"jsonl": JsonlWriter, "csv": CsvWriter, "parquet": ParquetWriter}
+
+
+def _open_at_offset(path, offset):
+    # The checkpoint refers to output that is no longer there
+    if offset and (not os.path.exists(path) or os.path.getsize(path) < offset):
+        raise SystemExit(
+            f"Cannot resume: {path} is missing or shorter than its checkpoint. "
+            "Run without --resume to start over."
+        )
+
+    # Drop anything written after the last checkpointed query
+    f = open(path, "a+" if offset else "w", encoding="utf-8", newline="")
+    if offset:
+        f.truncate(offset)
+        f.seek(offset)
+    return f
+
+
+def _sync(f):
+    f.flush()
+    os.fsync(f.fileno())
+    return f.tell()
+
+
+def _run_query(query_id, query, robota_engine):
+    started = time.perf_counter()
+    resumes = fetch_resumes(
+        query["site"],
+        job_position=query["job_position"],
+        location=query.get("location"),
+        experience=query.get("experience"),
+        salary=query.get("salary"),
+        enrich_top=query.get("enrich_top"),
+        robota_engine=robota_engine,
+    )
+    elapsed = time.perf_counter() - started
+    # Results of an "all" query may come from one site only
+    for site_name, error in resumes.site_errors.items():
+        print(f"Query {query_id}: skipped {site_name}: {error}", file=sys.stderr)
+    rows = [
+        {
+            "query_id": query_id,
+            "site": query["site"],
+            "query": query["job_position"],
+            **{field: resume.get(field) for field in FIELDS[3:]},
+        }
+        for resume in resumes
+    ]
+    return rows, elapsed
+
+
+def export(
+    queries, writer, checkpoint_path, completed, workers, robota_engine="chrome"
+):
+    """
+    Runs queries concurrently and streams their results to the writer.
+
+    At most `workers` queries are in flight at a time, so memory stays bounded
+    by the results of those queries regardless of the size of the queries file.
+    The time taken by each query is recorded in the checkpoint, so runs with
+    different robota.ua engines can be compared.
+
+    :return: Number of queries that failed.
+    """
+    failed = 0
+    pending = {}
+    queries = ((qid, q) for qid, q in queries if qid not in completed)
+
+    with ThreadPoolExecutor(max_workers=workers) as executor, open(
+        checkpoint_path, "a", encoding="utf-8"
+    ) as checkpoint:
+        while True:
+            # Keep the pool busy without reading the whole queries file ahead
+            for query_id, query in queries:
+                if query is None:
+                    failed += 1
+                    continue
+                future = executor.submit(_run_query, query_id, query, robota_engine)
+                pending[future] = query_id
+                if len(pending) >= workers:
+                    break
+
+            if not pending:
+                break
+
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                query_id = pending.pop(future)
+                try:
+                    rows, elapsed = future.result()
+                except Exception as e:
+                    # Not checkpointed, so the query is retried on --resume
+                    print(f"Query {query_id} failed: {e}", file=sys.stderr)
+                    failed += 1
+                    continue
+
+                offset = writer.write(rows)
+                entry = {
+                    "query_id": query_id,
+                    "offset": offset,
+                    "count": len(rows),
+                    "seconds": round(elapsed, 3),
+                }
+                checkpoint.write(json.dumps(entry) + "\n")
+                _sync(checkpoint)
+                print(f"Query {query_id}: {len(rows)} resumes in {elapsed:.1f}s.")
+
+    return failed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Export resumes for a file of search queries."
+    )
+    parser.add_argument(
+        "queries", help="File with one query per line (JSON or job position)."
+    )
+    parser.add_argument("output", help="Output file (directory for Parquet).")
+    parser.add_argument(
+        "--format",
+        choices=sorted(WRITERS),
+        help="Output format. Guessed from the output extension by default.",
+    )
+    parser.add_argument(
+        "--site",
+        default="all",
+        choices=SITES,
+        help="Site used for queries that do not specify one.",
+    )
+    parser.add_argument(
+        "--robota-engine",
+        default="chrome",
+        choices=["chrome", "api"],
+        help="Search robota.ua with Chrome or through its JSON API (experimental).",
+    )
+    parser.add_argument("--workers", type=int, default=2, help="Concurrent queries.")
+    parser.add_argument(
+        "--checkpoint", help="Checkpoint file. Defaults to <output>.checkpoint."
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Skip queries completed by a previous run and append to its output.",
+    )
+    args = parser.parse_args(argv)
+
+    output_format = args.format or os.path.splitext(args.output)[1].lstrip(".")
+    if output_format not in WRITERS:
+        parser.error("Unable to guess the output format, use --format.")
+
+    checkpoint_path = args.checkpoint or f"{args.output.rstrip(os.sep)}.checkpoint"
+    if args.resume:
+        completed, offset = load_checkpoint(checkpoint_path)
+    else:
+        completed, offset = set(), 0
+        if os.path.exists(checkpoint_path):
+            os.remove(checkpoint_path)
+
+    writer = WRITERS[output_format](args.output, offset, resume=args.resume)
+    try:
+        failed = export(
+            load_queries(args.queries, args.site),
+            writer,
+            checkpoint_path,
+            completed,
+            max(args.workers, 1),
+            args.robota_engine,
+        )
+    finally:
+        writer.close()
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
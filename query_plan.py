@@ -0,0 +1,235 @@
+import json
+import re
+from bisect import bisect_right
+from functools import lru_cache
+from typing import NamedTuple, Optional, Tuple
+from urllib.parse import quote, urlencode
+
+
+# Bucket tables: the lower bound (in years) of each bucket and the code the
+# site uses for it. A bucket covers [bound, next bound).
+WORK_UA_EXPERIENCE_BOUNDS = (0, 1, 2, 3, 6)
+WORK_UA_EXPERIENCE_CODES = (
+    0,  # "No experience"
+    1,  # "Up to 1 year"
+    164,  # "1 to 2 years"
+    165,  # "2 to 5 years"
+    166,  # "More than 5 years"
+)
+
+ROBOTA_UA_EXPERIENCE_BOUNDS = (0, 1, 2, 5, 10)
+ROBOTA_UA_EXPERIENCE_CODES = (
+    "0",  # "No experience"
+    "1",  # "Up to 1 year"
+    "3",  # "2 to 5 years"
+    "4",  # "5 to 10 years"
+    "5",  # "More than 10 years"
+)
+
+# Salary thresholds (UAH) and the IDs work.ua uses for them
+WORK_UA_SALARY_BOUNDS = (20000, 30000, 40000, 50000, 100000)
+WORK_UA_SALARY_IDS = (4, 5, 6, 7, 8)
+
+# "2-5", "3", and open-ended "5+" or "5-"
+RANGE_PATTERN = re.compile(r"^(\d+)(?:-(\d*)|(\+))?$")
+
+
+class InvalidQueryError(ValueError):
+    """Raised when a search filter or site cannot be understood."""
+
+
+class QueryPlan(NamedTuple):
+    site: str
+    url: str
+    # Experience codes of the site
+    experience_codes: Tuple
+    # (from ID, to ID) as used by work.ua, None for other sites or without salary
+    salary_ids: Optional[Tuple]
+    # (from, to) in UAH, to is None when there is no upper limit
+    salary_uah: Optional[Tuple]
+
+
+def parse_range(value):
+    """
+    Parses a number or a range of numbers.
+
+    :param value: A string like "3", "2-5", "5+" or "5-" (open-ended).
+    :return: Tuple (start, end), end is None for open-ended ranges.
+    :raises ValueError: If the value is not a valid number or range.
+    """
+    match = RANGE_PATTERN.match(value.replace(" ", ""))
+    if not match:
+        raise ValueError(f"Invalid range: {value!r}")
+
+    start, end, plus = match.groups()
+    start = int(start)
+    if end is None and not plus:
+        return start, start
+    if not end:
+        return start, None
+
+    end = int(end)
+    if start > end:
+        raise ValueError("Start value cannot be greater than the end value.")
+    return start, end
+
+
+def parse_salary_range(value):
+    """
+    Parses a salary value or range, a single value being a lower limit.
+
+    :param value: A string like "20000", "20000-50000" or "20000+".
+    :return: Tuple (start, end), end is None when there is no upper limit.
+    :raises ValueError: If the value is not a valid number or range.
+    """
+    start, end = parse_range(value)
+    if value.replace(" ", "").isdigit():
+        end = None
+    return start, end
+
+
+def lookup_buckets(bounds, codes, start, end):
+    """
+    Returns the codes of all buckets overlapping the interval [start, end].
+
+    :param bounds: Sorted lower bounds of the buckets.
+    :param codes: Code of each bucket.
+    :param start: Start of the interval, values below the first bound use the first bucket.
+    :param end: End of the interval or None for an open-ended interval.
+    :return: Tuple of codes in bucket order.
+    """
+    first = max(bisect_right(bounds, start) - 1, 0)
+    last = len(codes) - 1 if end is None else max(bisect_right(bounds, end) - 1, 0)
+    return codes[first : last + 1]
+
+
+def work_ua_experience_codes(start, end):
+    return lookup_buckets(
+        WORK_UA_EXPERIENCE_BOUNDS, WORK_UA_EXPERIENCE_CODES, start, end
+    )
+
+
+def robota_ua_experience_codes(start, end):
+    return lookup_buckets(
+        ROBOTA_UA_EXPERIENCE_BOUNDS, ROBOTA_UA_EXPERIENCE_CODES, start, end
+    )
+
+
+def work_ua_salary_ids(start, end):
+    """
+    Converts a salary interval into work.ua salary IDs.
+
+    The lower bound is rounded down and the upper bound rounded up to the
+    nearest threshold, so the filter never excludes matching resumes.
+
+    :param start: Minimum salary.
+    :param end: Maximum salary or None for no upper limit.
+    :return: Tuple (from ID, to ID), 0 meaning no limit.
+    """
+    index = bisect_right(WORK_UA_SALARY_BOUNDS, start) - 1
+    start_id = WORK_UA_SALARY_IDS[index] if index >= 0 else 0
+
+    end_id = 0
+    if end is not None:
+        index = bisect_right(WORK_UA_SALARY_BOUNDS, end - 1)
+        if index < len(WORK_UA_SALARY_IDS):
+            end_id = WORK_UA_SALARY_IDS[index]
+    return start_id, end_id
+
+
+def normalize_text(value):
+    # Lowercase and collapse whitespace, empty values become None
+    value = " ".join(value.split()).lower() if value else ""
+    return value or None
+
+
+def normalize_range(value):
+    value = value.replace(" ", "") if value else ""
+    return value or None
+
+
+def plan_query(site, job_position, location=None, experience=None, salary=None):
+    """
+    Builds the search plan (URL and encoded filters) for a query.
+
+    Plans are cached per normalized query, so repeated searches skip parsing.
+
+    :param site: "work_ua" or "robota_ua".
+    :param job_position: Job title to search for.
+    :param location: Optional location (in English).
+    :param experience: Optional experience value or range (e.g. "2-5", "5+").
+    :param salary: Optional salary value or range (e.g. "20000-50000").
+    :return: QueryPlan for the query.
+    :raises InvalidQueryError: If the site is not supported or a filter is invalid.
+    """
+    return _plan_query(
+        site,
+        normalize_text(job_position),
+        normalize_text(location),
+        normalize_range(experience),
+        normalize_range(salary),
+    )
+
+
+@lru_cache(maxsize=1024)
+def _plan_query(site, job_position, location, experience, salary):
+    try:
+        experience_range = parse_range(experience) if experience else None
+    except ValueError:
+        raise InvalidQueryError(f"Invalid experience range: {experience!r}")
+    try:
+        salary_range = parse_salary_range(salary) if salary else None
+    except ValueError:
+        raise InvalidQueryError(f"Invalid salary range: {salary!r}")
+
+    if site == "work_ua":
+        return _plan_work_ua(job_position, location, experience_range, salary_range)
+    if site == "robota_ua":
+        return _plan_robota_ua(job_position, location, experience_range, salary_range)
+    raise InvalidQueryError(f"Unsupported site: {site}")
+
+
+def _plan_work_ua(job_position, location, experience_range, salary_range):
+    position = job_position.replace(" ", "+")
+    path = f"resumes-{location}-{position}" if location else f"resumes-{position}"
+    url = f"https://www.work.ua/{quote(path, safe='+-')}/"
+
+    params = {}
+    codes = ()
+    if experience_range:
+        codes = work_ua_experience_codes(*experience_range)
+        params["experience"] = "+".join(map(str, codes))
+
+    salary_ids = None
+    if salary_range:
+        salary_ids = work_ua_salary_ids(*salary_range)
+        start_id, end_id = salary_ids
+        if start_id:
+            params["salaryfrom"] = start_id
+        if end_id:
+            params["salaryto"] = end_id
+
+    if params:
+        url += "?" + urlencode(params, safe="+", quote_via=quote)
+    return QueryPlan("work_ua", url, codes, salary_ids, salary_range)
+
+
+def _plan_robota_ua(job_position, location, experience_range, salary_range):
+    path = f"candidates/{job_position.replace(' ', '-')}/{location or 'ukraine'}"
+    url = f"https://robota.ua/{quote(path, safe='/-')}"
+
+    params = {}
+    codes = ()
+    if experience_range:
+        codes = robota_ua_experience_codes(*experience_range)
+        params["experienceIds"] = json.dumps(list(codes), separators=(",", ":"))
+
+    if salary_range:
+        start, end = salary_range
+        params["salary"] = json.dumps(
+            {"from": start, "to": end}, separators=(",", ":")
+        )
+
+    if params:
+        url += "?" + urlencode(params, quote_via=quote)
+    return QueryPlan("robota_ua", url, codes, None, salary_range)
@@ -0,0 +1,222 @@
+import asyncio
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
+
+import httpx
+from lxml import html
+
+
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
+
+# Only work.ua renders resume pages on the server. robota.ua candidate pages
+# are a JavaScript app, so a plain GET returns an empty shell.
+ENRICHABLE_HOSTS = ("work.ua", "www.work.ua")
+
+# Section headings (lowercased prefixes) used on resume detail pages
+SECTION_HEADINGS = {
+    "skills": ("знання і навички", "навички", "ключові навички", "skills"),
+    "experience": ("досвід роботи", "experience"),
+    "education": ("освіта", "education"),
+}
+
+# Maximum number of parsed detail pages kept in the cache
+CACHE_SIZE = 1000
+
+# LRU cache of parsed detail pages keyed by resume link:
+# {link: {"etag": ..., "last_modified": ..., "details": {...}}}
+_details_cache = OrderedDict()
+_details_cache_lock = threading.Lock()
+
+
+def _cache_get(link):
+    with _details_cache_lock:
+        entry = _details_cache.get(link)
+        if entry is not None:
+            _details_cache.move_to_end(link)
+        return entry
+
+
+def _cache_put(link, entry):
+    with _details_cache_lock:
+        _details_cache[link] = entry
+        _details_cache.move_to_end(link)
+        while len(_details_cache) > CACHE_SIZE:
+            _details_cache.popitem(last=False)
+
+
+def is_enrichable(link):
+    """
+    Checks whether a resume link points to a page that can be parsed without JavaScript.
+
+    :param link: The resume link.
+    :return: True if the detail page can be enriched.
+    """
+    return bool(link) and urlparse(link).hostname in ENRICHABLE_HOSTS
+
+
+def parse_resume_details(page_source):
+    """
+    Extracts skills, experience history and education from a resume detail page.
+
+    :param page_source: HTML source of the resume detail page.
+    :return: Dictionary with "skills", "experience" and "education" lists.
+    """
+    details = {"skills": [], "experience": [], "education": []}
+    try:
+        tree = html.fromstring(page_source)
+    except Exception as e:
+        print(f"Error parsing resume page: {e}")
+        return details
+
+    # Skills are usually rendered as tags, collect them directly if present
+    skills = tree.xpath('//*[contains(@class, "label-skill")]')
+    details["skills"] = _unique(
+        [" ".join(skill.text_content().split()) for skill in skills]
+    )
+
+    # Fall back to the text following each section heading
+    has_skill_tags = bool(details["skills"])
+    for heading in tree.xpath("//h2 | //h3"):
+        if _is_subheading(heading):
+            continue
+        heading_text = heading.text_content().strip().lower()
+        for section, prefixes in SECTION_HEADINGS.items():
+            if section == "skills" and has_skill_tags:
+                continue
+            if heading_text.startswith(prefixes):
+                details[section].extend(_section_entries(heading))
+
+    for section in details:
+        details[section] = _unique([entry for entry in details[section] if entry])
+
+    return details
+
+
+def _is_subheading(element):
+    # Entries inside a section (e.g. positions in the experience section) are
+    # headings styled down to a smaller size
+    classes = (element.get("class") or "").split()
+    return element.tag in ("h2", "h3") and bool({"h4", "h5"} & set(classes))
+
+
+def _section_entries(heading):
+    """
+    Collects the entries of a section up to the next section heading.
+
+    Each subheading starts a new entry and the text following it is joined to it.
+
+    :param heading: The heading element of the section.
+    :return: List of text entries.
+    """
+    entries = []
+    for sibling in heading.itersiblings():
+        if sibling.tag in ("h2", "h3") and not _is_subheading(sibling):
+            break
+        text = " ".join(sibling.text_content().split())
+        if not text:
+            continue
+        if _is_subheading(sibling) or not entries:
+            entries.append(text)
+        else:
+            entries[-1] = f"{entries[-1]}, {text}"
+    return entries
+
+
+def _unique(values):
+    # Remove duplicates while keeping the original order
+    return list(dict.fromkeys(values))
+
+
+async def _fetch_details(client, semaphore, link):
+    """
+    Fetches and parses a single resume detail page, revalidating cached entries.
+
+    :param client: The shared httpx.AsyncClient.
+    :param semaphore: Semaphore bounding the number of concurrent requests.
+    :param link: The resume link.
+    :return: Parsed details or None if the page could not be fetched.
+    """
+    cached = _cache_get(link)
+    headers = {}
+    if cached:
+        if cached["etag"]:
+            headers["If-None-Match"] = cached["etag"]
+        if cached["last_modified"]:
+            headers["If-Modified-Since"] = cached["last_modified"]
+
+    async with semaphore:
+        try:
+            response = await client.get(link, headers=headers)
+        except httpx.HTTPError as e:
+            print(f"Error loading resume details {link}: {e}")
+            return cached["details"] if cached else None
+
+    if response.status_code == 304 and cached:
+        return cached["details"]
+    if response.status_code != 200:
+        print(f"Error: Unable to fetch {link}. Status code: {response.status_code}")
+        return cached["details"] if cached else None
+
+    details = parse_resume_details(response.text)
+    _cache_put(
+        link,
+        {
+            "etag": response.headers.get("ETag"),
+            "last_modified": response.headers.get("Last-Modified"),
+            "details": details,
+        },
+    )
+    return details
+
+
+async def enrich_resumes(candidates, max_concurrency=5, timeout=20):
+    """
+    Adds detail-page information (skills, experience, education) to candidates.
+
+    Candidates whose pages cannot be parsed without JavaScript get None details.
+
+    :param candidates: List of candidate dictionaries with a "link" key.
+    :param max_concurrency: Maximum number of detail pages fetched at once.
+    :param timeout: Request timeout in seconds.
+    :return: New list of candidates with a "details" key added.
+    """
+    semaphore = asyncio.Semaphore(max_concurrency)
+    limits = httpx.Limits(max_connections=max_concurrency)
+    async with httpx.AsyncClient(
+        headers={"User-Agent": USER_AGENT},
+        timeout=timeout,
+        limits=limits,
+        follow_redirects=True,
+    ) as client:
+        results = await asyncio.gather(
+            *(
+                _fetch_details(client, semaphore, candidate["link"])
+                if is_enrichable(candidate.get("link"))
+                else asyncio.sleep(0)
+                for candidate in candidates
+            )
+        )
+
+    return [
+        {**candidate, "details": details}
+        for candidate, details in zip(candidates, results)
+    ]
+
+
+def enrich_resumes_sync(candidates, max_concurrency=5, timeout=20):
+    """
+    Synchronous wrapper around enrich_resumes.
+
+    Runs the coroutine in a worker thread when called from inside a running
+    event loop (e.g. from a Telegram bot handler).
+    """
+    coroutine = enrich_resumes(candidates, max_concurrency, timeout)
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coroutine)
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        return executor.submit(asyncio.run, coroutine).result()
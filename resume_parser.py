@@ -1,4 +1,8 @@
+import threading
+import time
+
 from selenium import webdriver
+from selenium.common.exceptions import WebDriverException
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
 from selenium.webdriver.chrome.service import Service
@@ -7,6 +11,10 @@ from selenium.webdriver.support import expected_conditions as EC
 from translate import Translator
 import requests
 
+from query_plan import InvalidQueryError, plan_query
+from resume_enricher import enrich_resumes_sync
+from robota_api import RobotaApiError, RobotaUaClient
+
 
 def get_usd_rate_nbu():
     url = "https://bank.gov.ua/NBUStatService/v1/statdirectory/exchange?json"
@@ -21,271 +29,315 @@ def get_usd_rate_nbu():
         return None
 
 
-def parse_experience_range_work_ua(experience_range):
-    """
-    Converts an experience range or a single experience value into corresponding experience codes.
+class ScrapingError(Exception):
+    """Raised when a site could not be scraped, as opposed to having no resumes."""
 
-    :param experience_range: A string representing a single experience value (e.g., "1")
-                             or a range (e.g., "2-5").
-    :return: A set of experience codes corresponding to the input range.
-    """
-    # Mapping of experience years to corresponding codes
-    experience_mapping = {
-        0: 0,  # "No experience" (code 0)
-        1: 1,  # "Up to 1 year" (code 1)
-        2: 164,  # "1 to 2 years" (code 164)
-        3: 165,  # "1 to 2 years" (code 164)
-        4: 165,  # "2 to 5 years" (code 165)
-        5: 165,  # "2 to 5 years" (code 165)
-        6: 166,  # "More than 5 years" (code 166)
-    }
 
-    # Initialize an empty set to store experience codes (set to ensure uniqueness)
-    experience_values = set()
+class DriverError(ScrapingError):
+    """Raised when the browser crashed or stopped responding."""
 
-    # Check if the input contains a hyphen indicating a range
-    if "-" in experience_range:
-        try:
-            # Split and map the range values to integers
-            start, end = map(int, experience_range.split("-"))
-
-            # Ensure that the start value is not greater than the end value
-            if start > end:
-                raise ValueError("Start value cannot be greater than the end value.")
-
-            # Loop through the range and map experience years to experience codes
-            for i in range(start, end + 1):
-                if i >= 0:
-                    experience_values.add(
-                        experience_mapping.get(i, 166)
-                    )  # Default to "More than 5 years" (code 166)
-
-        except ValueError as e:
-            # Handle invalid input (non-integer or invalid range)
-            raise ValueError(f"Invalid experience range: {e}")
-    else:
-        # If it's a single experience value, convert it to an integer and map it to the code
-        try:
-            experience = int(experience_range)
-            if experience >= 0:
-                experience_values.add(
-                    experience_mapping.get(experience, 166)
-                )  # Default to "More than 5 years" (code 166)
-            else:
-                raise ValueError("Experience cannot be negative.")
-        except ValueError:
-            # Handle non-integer input
-            raise ValueError(
-                "Invalid experience input. Please provide a valid number or range."
-            )
 
-    return experience_values
+class SiteError(ScrapingError):
+    """Raised when a site did not respond or served an error page instead of results."""
 
 
-def parse_salary_range_work_ua(salary):
-    """
-    Converts a salary range or a single salary value into a tuple of corresponding salary range IDs.
+class SiteUnavailableError(ScrapingError):
+    """Raised when a site is skipped because its circuit breaker is open."""
+
+
+def _error_text(error):
+    # WebDriverException's str() adds chromedriver's stack trace, keep only the message
+    message = (getattr(error, "msg", None) or str(error)).strip()
+    return message.splitlines()[0] if message else type(error).__name__
 
-    :param salary: A string representing a salary value (e.g., "20000", "20000-50000").
-    :return: A tuple with two integers corresponding to the salary range IDs, defaulting to (0, 0).
+
+class ResumeResults(list):
     """
-    salary_mapping = {
-        20000: 4,  # from 20,000
-        30000: 5,  # from 30,000
-        40000: 6,  # from 40,000
-        50000: 7,  # up to 50,000
-        100000: 8,  # up to 100,000
-    }
+    List of resumes that also records the sites skipped because they failed.
 
-    # Check if the input contains a range (e.g., "20000-50000")
-    if salary and "-" in salary:
-        try:
-            start, end = map(int, salary.split("-"))
-            # Get the corresponding range IDs from the mapping
-            start_value = salary_mapping.get(start, 0)
-            end_value = salary_mapping.get(end, 0)
-            return start_value, end_value
-        except ValueError:
-            # Handle case where the input is not a valid range
-            return 0, 0
+    site_errors maps a site name to the ScrapingError raised for it.
+    """
 
-    # If it's a single salary value, look up its corresponding ID
-    else:
-        try:
-            salary_value = int(salary)
-            salary_value = salary_mapping.get(salary_value, 0)
-            return salary_value, salary_value
-        except:
-            # Handle case where the input is not a valid salary
-            return 0, 0
+    def __init__(self, resumes=(), site_errors=None):
+        super().__init__(resumes)
+        self.site_errors = site_errors or {}
 
 
-def parse_experience_range_robota_ua(experience_range):
+class CircuitBreaker:
     """
-    Converts an experience range into a list of corresponding experience IDs.
+    Per-site circuit breaker.
 
-    :param experience_range: A string representing an experience range (e.g., "0", "2-3", "4-5").
-    :return: A list of experience IDs corresponding to the input range.
+    After failure_threshold consecutive failures the breaker opens and requests
+    fail fast for reset_timeout seconds. Then a single trial request is let
+    through (half-open): success closes the breaker, failure opens it again.
     """
-    experience_values = []
 
-    # Check if the input contains a range (e.g., "2-3")
-    if "-" in experience_range:
-        try:
-            start, end = map(int, experience_range.split("-"))
-            # Iterate through the range and append corresponding experience IDs
-            for i in range(start, end + 1):
-                if i < 1:
-                    experience_values.append("%220%22")  # No experience
-                elif 1 <= i < 2:
-                    experience_values.append("%221%22")  # Up to 1 year
-                elif 2 <= i < 5:
-                    experience_values.append("%223%22")  # 2 to 5 years
-                elif 5 <= i <= 10:
-                    experience_values.append("%224%22")  # 5 to 10 years
-                elif i > 10:
-                    experience_values.append("%225%22")  # More than 10 years
-        except ValueError:
-            # Handle case where the range is not valid (non-integer values)
-            return []
-    else:
-        try:
-            experience = int(experience_range)
-            # Handle a single experience value
-            if experience < 1:
-                experience_values.append("%220%22")  # No experience
-            elif 1 <= experience < 2:
-                experience_values.append("%221%22")  # Up to 1 year
-            elif 2 <= experience < 5:
-                experience_values.append("%223%22")  # 2 to 5 years
-            elif 5 <= experience < 10:
-                experience_values.append("%224%22")  # 5 to 10 years
-            elif experience >= 10:
-                experience_values.append("%225%22")  # More than 10 years
-        except ValueError:
-            # Handle case where the input is not a valid integer
-            return []
+    def __init__(self, name, failure_threshold=3, reset_timeout=300):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at = None
+        self.trial_in_progress = False
+        self.total_failures = 0
+        self.total_rejected = 0
+        self._lock = threading.Lock()
+
+    @property
+    def state(self):
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at >= self.reset_timeout:
+            return "half_open"
+        return "open"
+
+    def allow_request(self):
+        """
+        Checks whether a request to the site may be made.
 
-    return experience_values
+        :return: True if the request is allowed, False if it should fail fast.
+        """
+        with self._lock:
+            state = self.state
+            if state == "closed":
+                return True
+            if state == "half_open" and not self.trial_in_progress:
+                self.trial_in_progress = True
+                return True
+            self.total_rejected += 1
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+            self.trial_in_progress = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            self.total_failures += 1
+            if self.trial_in_progress or self.failures >= self.failure_threshold:
+                self.opened_at = time.monotonic()
+            self.trial_in_progress = False
+
+    def release_trial(self):
+        # Let another request try the site after a trial that ended unrelated to it
+        with self._lock:
+            self.trial_in_progress = False
+
+    def metrics(self):
+        with self._lock:
+            return {
+                "state": self.state,
+                "consecutive_failures": self.failures,
+                "total_failures": self.total_failures,
+                "total_rejected": self.total_rejected,
+            }
+
+
+CIRCUIT_BREAKERS = {
+    "work_ua": CircuitBreaker("work_ua"),
+    "robota_ua": CircuitBreaker("robota_ua"),
+}
+
+# Counters for driver failures, updated by every ResumeParser instance
+_driver_metrics = {"driver_failures": 0, "driver_restarts": 0}
+_driver_metrics_lock = threading.Lock()
+
+
+def _increment_metric(name):
+    with _driver_metrics_lock:
+        _driver_metrics[name] += 1
+
+
+def get_metrics():
+    """
+    Returns scraping health metrics: driver failure counters and circuit breaker state per site.
+
+    :return: Dictionary with the metrics.
+    """
+    with _driver_metrics_lock:
+        metrics = dict(_driver_metrics)
+    metrics["circuit_breakers"] = {
+        name: breaker.metrics() for name, breaker in CIRCUIT_BREAKERS.items()
+    }
+    return metrics
 
 
 class ResumeParser:
+    # Maximum time in seconds to wait for a page load
+    PAGE_LOAD_TIMEOUT = 30
+
+    # Messages shown by the sites when a search has no results
+    WORK_UA_NO_RESULTS = '//*[contains(text(), "не знайдено")]'
+    ROBOTA_UA_NO_RESULTS = (
+        '//*[contains(text(), "не знайдено") or contains(text(), "не знайшли")]'
+    )
+
     def __init__(self, driver_path):
         # Initialize Selenium WebDriver with headless Chrome options
+        self.driver_path = driver_path
         self.options = Options()
         self.options.add_argument("--headless")  # No GUI
         self.options.add_argument(
             "user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
         )
         self.options.add_argument("--disable-javascript")
-        self.driver = webdriver.Chrome(
-            service=Service(driver_path), options=self.options
-        )
+        self.driver = self._start_driver()
 
-    def parse_work_ua(self, job_position, location=None, experience=None, salary=None):
+    def _start_driver(self):
+        try:
+            driver = webdriver.Chrome(
+                service=Service(self.driver_path), options=self.options
+            )
+        except WebDriverException as e:
+            _increment_metric("driver_failures")
+            raise DriverError(f"Unable to start Chrome: {_error_text(e)}")
+        driver.set_page_load_timeout(self.PAGE_LOAD_TIMEOUT)
+        return driver
+
+    def _restart_driver(self):
+        # Replace a crashed or hung browser with a fresh instance
+        try:
+            self.driver.quit()
+        except Exception:
+            pass
+        _increment_metric("driver_restarts")
+        self.driver = self._start_driver()
+
+    def _is_driver_alive(self):
         """
-        Parses job resumes from work.ua based on given filters like job position, location, experience, and salary.
+        Checks whether the browser still responds to commands.
 
-        :param job_position: Job title to search for.
-        :param location: Optional location to filter resumes by.
-        :param experience: Optional experience range to filter resumes by.
-        :param salary: Optional salary range to filter resumes by.
-        :return: List of resumes with job title, salary, personal info, location, and link.
+        :return: True if the driver is responsive, False otherwise.
         """
-        # Construct URL with optional location and job position
-        url = f"https://www.work.ua/resumes-{f'{location.lower()}-' if location else ''}{job_position.replace(' ', '+').lower()}/"
-
-        # Add experience filter to URL if provided
-        if experience:
-            experience_value = parse_experience_range_work_ua(experience)
-            experience_filter = "+".join(map(str, experience_value))
-            url += f"?experience={experience_filter}"
-
-        # Add salary filter to URL if provided
-        if salary:
-            start, end = 0, 0
-            salary_result = parse_salary_range_work_ua(salary)
-
-            if len(salary_result) == 2:
-                start, end = salary_result
-            else:
-                start = salary_result
+        try:
+            self.driver.execute_script("return document.readyState")
+            return True
+        except WebDriverException:
+            return False
 
-            # Add salary range to URL
-            if "?" not in url and "&" not in url:
-                url += f"?salaryfrom={start}"
-            else:
-                url += f"&salaryfrom={start}"
+    def _raise_failure(self, url, error):
+        """
+        Raises the error matching the cause of a failed page load.
+
+        :param url: The URL that was being loaded.
+        :param error: The WebDriverException that was raised.
+        :raises DriverError: If the browser stopped responding.
+        :raises SiteError: If the browser works but the site did not serve results.
+        """
+        if self._is_driver_alive():
+            raise SiteError(f"Unable to load {url}: {_error_text(error)}")
+        _increment_metric("driver_failures")
+        raise DriverError(
+            f"Browser stopped responding while loading {url}: {_error_text(error)}"
+        )
 
-            if end:
-                url += f"&salaryto={end}"
+    def _scrape_page(self, url, card_selector, empty_xpath, parse_card):
+        """
+        Loads a search page once and parses its resume cards.
 
+        :return: List of resumes, empty if the page shows the "no results" message.
+        :raises DriverError: If the browser crashed or hung.
+        :raises SiteError: If the site did not respond or served no results list.
+        """
+        print(f"Loading URL: {url}")
         try:
-            # Attempt to load the constructed URL
-            print(f"Loading URL: {url}.")
+            # Raises TimeoutException after PAGE_LOAD_TIMEOUT, or net::ERR_*
+            # when the site is unreachable
             self.driver.get(url)
-        except Exception as e:
-            print(f"Error loading URL: {e}.")
-            return []
+        except WebDriverException as e:
+            self._raise_failure(url, e)
 
-        resumes = []
         try:
-            # Wait for resume cards to be loaded on the page
+            # Wait for either resume cards or the "no results" message, anything
+            # else (error page, captcha) is a site failure
             WebDriverWait(self.driver, 20).until(
-                EC.presence_of_all_elements_located((By.CLASS_NAME, "resume-link"))
+                EC.any_of(
+                    EC.presence_of_element_located((By.CSS_SELECTOR, card_selector)),
+                    EC.presence_of_element_located((By.XPATH, empty_xpath)),
+                )
             )
-            cards = self.driver.find_elements(By.CSS_SELECTOR, ".card.resume-link")
+            cards = self.driver.find_elements(By.CSS_SELECTOR, card_selector)
+        except WebDriverException as e:
+            self._raise_failure(url, e)
 
-            for card in cards:
-                try:
-                    # Extract resume details from each card
-                    title = card.find_element(By.CSS_SELECTOR, "h2 a").text.strip()
+        resumes = []
+        for card in cards:
+            try:
+                resumes.append(parse_card(card))
+            except Exception as e:
+                if not self._is_driver_alive():
+                    _increment_metric("driver_failures")
+                    raise DriverError(f"Browser stopped responding: {_error_text(e)}")
+                print(f"Error parsing a card: {e}")
+        return resumes
 
-                    # Extract personal details (name, age, city) if available
-                    name = self._extract_element_text(card, "p.mt-xs.mb-0 .strong-600")
-                    age = self._extract_element_text(
-                        card, "p.mt-xs.mb-0 span:nth-child(2)"
-                    )
-                    city = self._extract_element_text(
-                        card, "p.mt-xs.mb-0 span:nth-child(3)"
-                    )
+    def _scrape(self, url, card_selector, empty_xpath, parse_card):
+        """
+        Loads a search page and parses its resume cards.
+
+        If the browser crashes or hangs while loading or parsing the page, it is
+        restarted and the page is retried once.
+
+        :param url: The URL of the search page.
+        :param card_selector: The CSS selector of the resume cards.
+        :param empty_xpath: XPath of the message shown when nothing was found.
+        :param parse_card: Function converting a card element into a resume dictionary.
+        :return: List of resumes, empty if the site has no matching resumes.
+        :raises DriverError: If the browser failed again after a restart.
+        :raises SiteError: If the site did not serve results.
+        """
+        try:
+            return self._scrape_page(url, card_selector, empty_xpath, parse_card)
+        except DriverError as e:
+            print(f"Driver failure, restarting the browser: {e}")
 
-                    # Extract salary information
-                    salary_text = self._extract_element_text(
-                        card, "p.h5.strong-600.mt-xs.mb-0.nowrap"
-                    )
+        self._restart_driver()
+        return self._scrape_page(url, card_selector, empty_xpath, parse_card)
 
-                    # Get the resume link
-                    resume_link = card.find_element(
-                        By.CSS_SELECTOR, "h2 a"
-                    ).get_attribute("href")
-
-                    # Output the resume details
-                    # print(f"Title: {title}")
-                    # print(f"Salary: {salary_text}")
-                    # print(f"Info: {name}, {age}")
-                    # print(f"Location: {city}")
-                    # print(f"Link: {resume_link}")
-                    # print()
-
-                    # Add resume data to the results list
-                    resumes.append(
-                        {
-                            "title": title,
-                            "salary": salary_text,
-                            "personal_info": f"{name}, {age}",
-                            "location": city,
-                            "link": resume_link,
-                        }
-                    )
-                except Exception as e:
-                    print(f"Error parsing a card: {e}")
-                    continue
+    def parse_work_ua(self, job_position, location=None, experience=None, salary=None):
+        """
+        Parses job resumes from work.ua based on given filters like job position, location, experience, and salary.
 
-        except Exception as e:
-            print(f"Error while parsing work.ua: {e}")
+        :param job_position: Job title to search for.
+        :param location: Optional location to filter resumes by.
+        :param experience: Optional experience range to filter resumes by.
+        :param salary: Optional salary range to filter resumes by.
+        :return: List of resumes with job title, salary, personal info, location, and link.
+        """
+        # Build the search URL with the encoded filters
+        url = plan_query("work_ua", job_position, location, experience, salary).url
 
-        return resumes
+        return self._scrape(
+            url, ".card.resume-link", self.WORK_UA_NO_RESULTS, self._parse_work_ua_card
+        )
+
+    def _parse_work_ua_card(self, card):
+        # Extract resume details from each card
+        title = card.find_element(By.CSS_SELECTOR, "h2 a").text.strip()
+
+        # Extract personal details (name, age, city) if available
+        name = self._extract_element_text(card, "p.mt-xs.mb-0 .strong-600")
+        age = self._extract_element_text(card, "p.mt-xs.mb-0 span:nth-child(2)")
+        city = self._extract_element_text(card, "p.mt-xs.mb-0 span:nth-child(3)")
+
+        # Extract salary information
+        salary_text = self._extract_element_text(
+            card, "p.h5.strong-600.mt-xs.mb-0.nowrap"
+        )
+
+        # Get the resume link
+        resume_link = card.find_element(By.CSS_SELECTOR, "h2 a").get_attribute("href")
+
+        return {
+            "title": title,
+            "salary": salary_text,
+            "personal_info": f"{name}, {age}",
+            "location": city,
+            "link": resume_link,
+        }
 
     def _extract_element_text(self, card, selector):
         """
@@ -306,115 +358,65 @@ class ResumeParser:
     def parse_robota_ua(
         self, job_position, location=None, experience=None, salary=None
     ):
-        url = f"https://robota.ua/candidates/{job_position.replace(' ', '-').lower()}/{f'{location.lower()}' if location else 'ukraine'}"
-
-        # Checking and adding parameters
-        if experience:
-            experience_values = parse_experience_range_robota_ua(experience)
-            experience_filter = "%2C".join(experience_values)
-            if "?" not in url:
-                url += f"?experienceIds=%5B{experience_filter}%5D"
-            else:
-                url += f"&experienceIds=%5B{experience_filter}%5D"
-
-        if salary:
-            if "-" in salary:
-                start, end = map(int, salary.split("-"))
-            else:
-                start = salary
-                end = "null"
-            if "?" not in url and "&" not in url:
-                url += f"?salary=%7B%22from%22%3A{start}%2C%22to%22%3A{end}%7D"
-            else:
-                url += f"&salary=%7B%22from%22%3A{start}%2C%22to%22%3A{end}%7D"
+        # Build the search URL with the encoded filters
+        url = plan_query("robota_ua", job_position, location, experience, salary).url
 
-        try:
-            print(f"Loading URL: {url}")
-            self.driver.get(url)
-        except Exception as e:
-            print(f"Error loading URL: {e}")
-            return []
+        return self._scrape(
+            url, ".cv-card", self.ROBOTA_UA_NO_RESULTS, self._parse_robota_ua_card
+        )
 
-        resumes = []
+    def _parse_robota_ua_card(self, card):
+        title = card.find_element(
+            By.CSS_SELECTOR, "p.santa-m-0.santa-typo-h3.santa-pb-10"
+        ).text.strip()
 
-        # Input search criteria and submit the search
         try:
-            WebDriverWait(self.driver, 20).until(
-                EC.presence_of_element_located((By.CLASS_NAME, "cv-card"))
-            )
-            cards = self.driver.find_elements(By.CSS_SELECTOR, ".cv-card")
-
-            for card in cards:
-                try:
-                    title = card.find_element(
-                        By.CSS_SELECTOR, "p.santa-m-0.santa-typo-h3.santa-pb-10"
-                    ).text.strip()
-
-                    try:
-                        name = card.find_element(
-                            By.CSS_SELECTOR, '[data-id="cv-speciality"] + div p'
-                        ).text
-                    except Exception:
-                        name = None
-
-                    try:
-                        city = card.find_element(
-                            By.CSS_SELECTOR, '[data-id="cv-city-tag"]'
-                        ).text
-                    except Exception:
-                        city = None
-
-                    try:
-                        age = card.find_element(
-                            By.XPATH,
-                            './/*[contains(text(), " років") or contains(text(), " роки") or contains(text(), " рік")]',
-                        ).text.strip()
-                    except Exception:
-                        age = None
+            name = card.find_element(
+                By.CSS_SELECTOR, '[data-id="cv-speciality"] + div p'
+            ).text
+        except Exception:
+            name = None
 
-                    try:
-                        salary_text = card.find_element(
-                            By.XPATH,
-                            './/*[contains(text(), "$") or contains(text(), "грн")]',
-                        ).text.strip()
-                    except Exception:
-                        salary_text = None
+        try:
+            city = card.find_element(By.CSS_SELECTOR, '[data-id="cv-city-tag"]').text
+        except Exception:
+            city = None
 
-                    try:
-                        resume_link = card.find_element(By.TAG_NAME, "a").get_attribute(
-                            "href"
-                        )
-                    except Exception:
-                        resume_link = None
-
-                    # print("Title: ", title)
-                    # print("Salary: ", salary_text)
-                    # print(f"Info: {name}, {age}")
-                    # print("Location: ", city)
-                    # print("Link: ", resume_link)
-                    # print()
-
-                    resumes.append(
-                        {
-                            "title": title,
-                            "salary": salary_text,
-                            "personal_info": f"{name}, {age}",
-                            "location": city,
-                            "link": resume_link,
-                        }
-                    )
-                except Exception as e:
-                    print(f"Error parsing a card: {e}")
-                    continue
+        try:
+            age = card.find_element(
+                By.XPATH,
+                './/*[contains(text(), " років") or contains(text(), " роки") or contains(text(), " рік")]',
+            ).text.strip()
+        except Exception:
+            age = None
 
-        except Exception as e:
-            print(f"Error while parsing robota.ua: {e}")
+        try:
+            salary_text = card.find_element(
+                By.XPATH,
+                './/*[contains(text(), "$") or contains(text(), "грн")]',
+            ).text.strip()
+        except Exception:
+            salary_text = None
 
-        return resumes
+        try:
+            resume_link = card.find_element(By.TAG_NAME, "a").get_attribute("href")
+        except Exception:
+            resume_link = None
+
+        return {
+            "title": title,
+            "salary": salary_text,
+            "personal_info": f"{name}, {age}",
+            "location": city,
+            "link": resume_link,
+        }
 
     def close(self):
-        # Close the browser instance
-        self.driver.quit()
+        # Close the browser instance, it may already be gone after a crash
+        try:
+            self.driver.quit()
+        except Exception as e:
+            print(f"Error closing the browser: {e}")
 
 
 def translate_location(location, source_lang="uk", target_lang="en"):
@@ -501,6 +503,80 @@ def sort_candidates(candidates, job_position, location, salary_range):
     return sorted(scored_candidates, key=lambda x: x["score"], reverse=True)
 
 
+def calculate_details_score(candidate, job_position):
+    """
+    Calculate an additional relevance score from the candidate's detail page.
+
+    :param candidate: Dictionary with candidate details, including the "details" key.
+    :param job_position: Desired job position (e.g., "Python Developer").
+    :return: Additional relevance score (int).
+    """
+    details = candidate.get("details")
+    if not details:
+        return 0
+
+    score = 0
+    keywords = job_position.lower().split()
+
+    # Keyword matching in skills
+    skills = " ".join(details.get("skills", [])).lower()
+    score += sum(3 for keyword in keywords if keyword in skills)
+
+    # Keyword matching in previous positions
+    experience = " ".join(details.get("experience", [])).lower()
+    score += sum(2 for keyword in keywords if keyword in experience)
+
+    # Small bonus for a filled-in education section
+    if details.get("education"):
+        score += 1
+
+    return score
+
+
+def enrich_top_candidates(sorted_candidates, job_position, top_n, max_concurrency=5):
+    """
+    Fetch detail pages for the top-N candidates and re-rank them.
+
+    Only the first top_n candidates are enriched, so the added latency
+    grows with top_n rather than with the whole result set.
+
+    :param sorted_candidates: Candidates sorted by coarse score.
+    :param job_position: Desired job position.
+    :param top_n: Number of top candidates to enrich.
+    :param max_concurrency: Maximum number of detail pages fetched at once.
+    :return: List with the enriched top-N re-ranked, followed by the rest.
+    """
+    top, rest = sorted_candidates[:top_n], sorted_candidates[top_n:]
+    try:
+        top = enrich_resumes_sync(top, max_concurrency=max_concurrency)
+    except Exception as e:
+        print(f"Error while enriching resumes: {e}")
+        return sorted_candidates
+
+    top = [
+        {
+            **candidate,
+            "score": candidate["score"]
+            + calculate_details_score(candidate, job_position),
+        }
+        for candidate in top
+    ]
+    return sorted(top, key=lambda x: x["score"], reverse=True) + rest
+
+
+# Shared robota.ua API client, so searches reuse its connection pool
+_robota_client = None
+_robota_client_lock = threading.Lock()
+
+
+def get_robota_client():
+    global _robota_client
+    with _robota_client_lock:
+        if _robota_client is None:
+            _robota_client = RobotaUaClient()
+        return _robota_client
+
+
 # Function to fetch resumes based on the site and filters
 def fetch_resumes(
     site: str,
@@ -508,48 +584,116 @@ def fetch_resumes(
     location=None,
     experience=None,
     salary=None,
+    enrich_top=None,
+    robota_engine="chrome",
 ):
+    """
+    Fetches, scores and sorts resumes from the selected site(s).
+
+    robota.ua is scraped with Chrome by default; pass robota_engine="api" to
+    search through its JSON API instead.
+
+    :return: ResumeResults sorted by score, empty if the sites have no matching
+             resumes. Its site_errors name the sites skipped because they failed.
+    :raises InvalidQueryError: If the site or a filter is invalid.
+    :raises ScrapingError: If none of the selected sites could be scraped.
+    """
+    if site not in ("work_ua", "robota_ua", "all"):
+        raise InvalidQueryError(f"Unsupported site: {site}")
+
+    parser = None
     try:
-        # Specify the path to the Chromedriver executable
-        chromedriver_path = "/usr/local/bin/chromedriver"  # Update the path if Chromedriver is not in PATH
-        parser = ResumeParser(driver_path=chromedriver_path)
+        # Translate the location once for all sites
+        search_location = translate_location(location) if location else location
 
         # Helper function to fetch resumes for a site
         def fetch_for_site(site_name: str):
-            if site_name == "work_ua":
-                return parser.parse_work_ua(
-                    job_position,
-                    location=translate_location(location) if location else location,
-                    experience=experience,
-                    salary=salary,
-                )
-            elif site_name == "robota_ua":
-                return parser.parse_robota_ua(
-                    job_position,
-                    location=translate_location(location) if location else location,
-                    experience=experience,
-                    salary=salary,
+            nonlocal parser
+            # Validate the query before touching the site, invalid filters are not site failures
+            plan = plan_query(
+                site_name, job_position, search_location, experience, salary
+            )
+
+            # Fail fast while the site is known to be down
+            breaker = CIRCUIT_BREAKERS[site_name]
+            if not breaker.allow_request():
+                raise SiteUnavailableError(
+                    f"{site_name} is temporarily unavailable, try again later."
                 )
-            else:
-                raise ValueError(f"Unsupported site: {site_name}")
+
+            try:
+                if site_name == "robota_ua" and robota_engine == "api":
+                    try:
+                        resumes = get_robota_client().search(
+                            plan, job_position, location=search_location
+                        )
+                    except RobotaApiError as e:
+                        raise SiteError(str(e))
+                else:
+                    if parser is None:
+                        # Specify the path to the Chromedriver executable
+                        chromedriver_path = "/usr/local/bin/chromedriver"  # Update the path if Chromedriver is not in PATH
+                        parser = ResumeParser(driver_path=chromedriver_path)
+
+                    parse = (
+                        parser.parse_work_ua
+                        if site_name == "work_ua"
+                        else parser.parse_robota_ua
+                    )
+                    resumes = parse(
+                        job_position,
+                        location=search_location,
+                        experience=experience,
+                        salary=salary,
+                    )
+            except SiteError:
+                breaker.record_failure()
+                raise
+            except Exception:
+                # Not the site's fault, e.g. a local browser crash or invalid
+                # filters. Browser health is tracked by the driver metrics.
+                breaker.release_trial()
+                raise
+
+            breaker.record_success()
+            return resumes
 
         # Fetch resumes based on the selected site(s)
+        site_errors = {}
         if site == "work_ua" or site == "robota_ua":
             all_resumes = fetch_for_site(site)
         else:
-            all_resumes = fetch_for_site("work_ua") + fetch_for_site("robota_ua")
+            # A failing site does not hide the results of the other one
+            all_resumes = []
+            for site_name in ("work_ua", "robota_ua"):
+                try:
+                    all_resumes += fetch_for_site(site_name)
+                except ScrapingError as e:
+                    print(f"Error while fetching {site_name}: {e}")
+                    site_errors[site_name] = e
+            if len(site_errors) == 2:
+                raise site_errors["work_ua"]
 
         # Sort resumes based on the selected criteria
         sorted_candidates = sort_candidates(all_resumes, job_position, location, salary)
 
-        return sorted_candidates
+        # Optionally enrich the current top-N with their detail pages
+        if enrich_top:
+            sorted_candidates = enrich_top_candidates(
+                sorted_candidates, job_position, enrich_top
+            )
+
+        return ResumeResults(sorted_candidates, site_errors)
 
+    except (InvalidQueryError, ScrapingError):
+        # Let callers tell invalid input or a failed scrape apart from an empty result
+        raise
     except Exception as e:
         print(f"Error occurred while fetching resumes: {e}")
-        return []  # Return an empty list in case of error
+        return ResumeResults()  # Return an empty list in case of error
     finally:
         # Ensure the parser is always closed
-        if "parser" in locals():
+        if parser is not None:
             parser.close()
 
 
@@ -0,0 +1,216 @@
+import os
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+
+# Base URLs can be overridden, e.g. to serve recorded responses locally
+ROBOTA_UA_API_URL = os.environ.get(
+    "ROBOTA_UA_API_URL", "https://employer-api.robota.ua"
+)
+ROBOTA_UA_DICTIONARY_URL = os.environ.get(
+    "ROBOTA_UA_DICTIONARY_URL", "https://api.robota.ua"
+)
+ROBOTA_UA_CANDIDATE_URL = "https://robota.ua/candidates/{resume_id}"
+
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
+
+
+class RobotaApiError(Exception):
+    """Raised when the robota.ua API request fails or returns an unexpected response."""
+
+
+def create_session(pool_size=10, retries=2):
+    """
+    Creates an HTTP session with a connection pool and retries on server errors.
+
+    :param pool_size: Maximum number of pooled connections per host.
+    :param retries: Number of retries for failed requests.
+    :return: Configured requests.Session.
+    """
+    retry = Retry(
+        total=retries,
+        backoff_factor=0.5,
+        status_forcelist=(502, 503, 504),
+        # Searches do not change anything, so POST is safe to retry
+        allowed_methods=frozenset({"GET", "POST"}),
+    )
+    adapter = HTTPAdapter(
+        pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry
+    )
+    session = requests.Session()
+    session.headers.update({"User-Agent": USER_AGENT, "Accept": "application/json"})
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def format_age(age):
+    """
+    Formats an age the way robota.ua shows it, e.g. "21 рік", "34 роки", "29 років".
+
+    :param age: Age in years.
+    :return: The age with the Ukrainian plural form of "year".
+    """
+    if age % 10 == 1 and age % 100 != 11:
+        return f"{age} рік"
+    if 2 <= age % 10 <= 4 and not 12 <= age % 100 <= 14:
+        return f"{age} роки"
+    return f"{age} років"
+
+
+def parse_resume_document(document):
+    """
+    Maps a resume document from the robota.ua API onto the resume schema.
+
+    The field names are provisional: the test fixtures were written by hand,
+    not captured from the live API.
+
+    :param document: A single item of the "documents" list in the API response.
+    :return: Dictionary with title, salary, personal info, location and link.
+    """
+    # Format numeric salaries like the site does, e.g. "30 000 грн"
+    salary = document.get("salary") or None
+    if isinstance(salary, (int, float)):
+        currency = document.get("currencySign") or "грн"
+        salary = f"{int(salary):,} {currency}".replace(",", " ")
+
+    age = document.get("age") or None
+    if isinstance(age, int):
+        age = format_age(age)
+
+    name = document.get("displayName") or document.get("fullName")
+    resume_id = document.get("resumeId") or document.get("id")
+    link = ROBOTA_UA_CANDIDATE_URL.format(resume_id=resume_id) if resume_id else None
+
+    return {
+        "title": (document.get("speciality") or "").strip(),
+        "salary": salary,
+        "personal_info": f"{name}, {age}",
+        "location": document.get("cityName"),
+        "link": link,
+    }
+
+
+class RobotaUaClient:
+    """
+    Searches robota.ua candidates through the JSON endpoint used by its front end.
+
+    Experimental: the endpoint and payload are not verified against the live
+    site yet, so Chrome remains the default engine.
+    """
+
+    def __init__(
+        self,
+        api_url=ROBOTA_UA_API_URL,
+        dictionary_url=ROBOTA_UA_DICTIONARY_URL,
+        session=None,
+        page_size=100,
+        timeout=20,
+    ):
+        self.api_url = api_url.rstrip("/")
+        self.dictionary_url = dictionary_url.rstrip("/")
+        self.session = session or create_session()
+        self.page_size = page_size
+        self.timeout = timeout
+        self._city_ids = None
+        self._city_ids_lock = threading.Lock()
+
+    def _request(self, method, url, **kwargs):
+        try:
+            response = self.session.request(
+                method, url, timeout=self.timeout, **kwargs
+            )
+            response.raise_for_status()
+            return response.json()
+        except (requests.RequestException, ValueError) as e:
+            raise RobotaApiError(f"Request to {url} failed: {e}")
+
+    def get_city_id(self, location):
+        """
+        Looks up the robota.ua city ID for a location name.
+
+        :param location: City name in English, Ukrainian or as used in robota.ua URLs.
+        :return: The city ID, or 0 (all of Ukraine) if the city is unknown.
+        """
+        if not location:
+            return 0
+
+        # The city dictionary is loaded once and shared by all searches
+        with self._city_ids_lock:
+            if self._city_ids is None:
+                self._city_ids = self._load_city_ids()
+
+        city_id = self._city_ids.get(location.lower())
+        if city_id is None:
+            print(f"Unknown robota.ua city {location!r}, searching all of Ukraine.")
+            return 0
+        return city_id
+
+    def _load_city_ids(self):
+        """
+        Loads the city dictionary as a mapping of lowercased names to city IDs.
+
+        :raises RobotaApiError: If the request fails or the dictionary has an unexpected shape.
+        """
+        cities = self._request("GET", f"{self.dictionary_url}/dictionary/city")
+        city_ids = {}
+        try:
+            for city in cities:
+                for key in ("urlSection", "en", "ua", "ru"):
+                    if city.get(key):
+                        city_ids.setdefault(city[key].lower(), city["id"])
+        except (AttributeError, KeyError, TypeError) as e:
+            raise RobotaApiError(f"Unexpected city dictionary from robota.ua: {e!r}")
+        return city_ids
+
+    def search(self, plan, job_position, location=None, max_results=100):
+        """
+        Searches resumes matching a robota.ua query plan.
+
+        :param plan: QueryPlan for robota.ua with the encoded filters.
+        :param job_position: Job title to search for.
+        :param location: Optional location to filter resumes by.
+        :param max_results: Maximum number of resumes to return.
+        :return: List of resumes with job title, salary, personal info, location, and link.
+        :raises RobotaApiError: If the API request fails or returns an unexpected response.
+        """
+        salary_from, salary_to = plan.salary_uah or (0, None)
+        payload = {
+            "keyWords": job_position,
+            "cityId": self.get_city_id(location),
+            "experienceIds": list(plan.experience_codes),
+            "salary": {"from": salary_from, "to": salary_to or 0},
+            "period": "ThreeMonths",
+            "sort": "UpdateDate",
+            "searchType": "default",
+            "showCvWithoutSalary": not plan.salary_uah,
+            "count": min(self.page_size, max_results),
+            "page": 0,
+        }
+
+        resumes = []
+        while len(resumes) < max_results:
+            data = self._request("POST", f"{self.api_url}/cvdb/resumes", json=payload)
+            try:
+                documents = data.get("documents") or []
+                resumes.extend(parse_resume_document(document) for document in documents)
+
+                # Stop on the last page
+                last_page = (
+                    len(documents) < payload["count"]
+                    or len(resumes) >= int(data.get("total") or 0)
+                )
+            except (AttributeError, KeyError, TypeError, ValueError) as e:
+                raise RobotaApiError(f"Unexpected response from robota.ua API: {e!r}")
+
+            if last_page:
+                break
+            payload["page"] += 1
+
+        return resumes[:max_results]
+
+    def close(self):
+        self.session.close()
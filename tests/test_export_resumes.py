@@ -0,0 +1,150 @@
+import csv
+import json
+
+import pytest
+
+import export_resumes
+from resume_parser import ResumeResults
+
+
+def fake_fetch_resumes(site, job_position, **kwargs):
+    if job_position == "fail":
+        raise RuntimeError("site is down")
+    return ResumeResults(
+        [
+            {
+                "title": job_position,
+                "salary": "30 000 грн",
+                "personal_info": "Іван, 28 років",
+                "location": "Київ",
+                "link": f"https://www.work.ua/resumes/{i}/",
+                "score": 10,
+            }
+            for i in range(2)
+        ]
+    )
+
+
+@pytest.fixture
+def queries(tmp_path, monkeypatch):
+    monkeypatch.setattr(export_resumes, "fetch_resumes", fake_fetch_resumes)
+    path = tmp_path / "queries.txt"
+    path.write_text(
+        "Python Developer\n"
+        '{"site": "work_ua", "job_position": "QA", "salary": "20000-50000"}\n'
+        "# comment\n"
+        "fail\n",
+        encoding="utf-8",
+    )
+    return path
+
+
+def read_jsonl(path):
+    return [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+
+
+def test_export_jsonl(queries, tmp_path):
+    output = tmp_path / "out.jsonl"
+
+    assert export_resumes.main([str(queries), str(output)]) == 1
+
+    rows = read_jsonl(output)
+    assert sorted({row["query_id"] for row in rows}) == [1, 2]
+    assert len(rows) == 4
+    checkpoint = read_jsonl(tmp_path / "out.jsonl.checkpoint")
+    assert sorted(entry["query_id"] for entry in checkpoint) == [1, 2]
+
+
+def test_invalid_lines_do_not_stop_the_export(queries, tmp_path, capsys):
+    with open(queries, "a", encoding="utf-8") as f:
+        f.write('{"job_position": "QA", "salary": \n')
+        f.write('{"site": "work.ua", "job_position": "QA"}\n')
+        f.write('{"site": "all"}\n')
+        f.write("Data Analyst\n")
+    output = tmp_path / "out.jsonl"
+
+    assert export_resumes.main([str(queries), str(output)]) == 1
+
+    # Queries after the bad lines still run and are checkpointed
+    assert sorted({row["query"] for row in read_jsonl(output)}) == [
+        "Data Analyst",
+        "Python Developer",
+        "QA",
+    ]
+    checkpoint = read_jsonl(tmp_path / "out.jsonl.checkpoint")
+    assert sorted(entry["query_id"] for entry in checkpoint) == [1, 2, 8]
+    errors = capsys.readouterr().err
+    assert "Line 5: invalid query" in errors
+    assert "Line 6: invalid query: unknown site 'work.ua'" in errors
+    assert "Line 7: invalid query" in errors
+
+
+def test_robota_engine_is_passed_and_timed(queries, tmp_path, monkeypatch):
+    engines = []
+
+    def fetch(site, job_position, **kwargs):
+        engines.append(kwargs["robota_engine"])
+        return fake_fetch_resumes(site, job_position, **kwargs)
+
+    monkeypatch.setattr(export_resumes, "fetch_resumes", fetch)
+    output = tmp_path / "out.jsonl"
+
+    export_resumes.main([str(queries), str(output), "--robota-engine", "api"])
+
+    assert set(engines) == {"api"}
+    checkpoint = read_jsonl(tmp_path / "out.jsonl.checkpoint")
+    assert all(entry["seconds"] >= 0 for entry in checkpoint)
+
+
+def test_resume_drops_output_after_checkpoint(queries, tmp_path):
+    output = tmp_path / "out.jsonl"
+    export_resumes.main([str(queries), str(output)])
+    size = output.stat().st_size
+    with open(output, "a", encoding="utf-8") as f:
+        f.write('{"query_id": 4, "partial')
+
+    export_resumes.main([str(queries), str(output), "--resume"])
+
+    assert output.stat().st_size == size
+    assert len(read_jsonl(output)) == 4
+
+
+def test_resume_with_missing_output_fails(queries, tmp_path):
+    output = tmp_path / "out.jsonl"
+    export_resumes.main([str(queries), str(output)])
+    output.unlink()
+
+    with pytest.raises(SystemExit):
+        export_resumes.main([str(queries), str(output), "--resume"])
+
+    assert not output.exists()
+
+
+def test_export_csv_resume_keeps_single_header(queries, tmp_path):
+    output = tmp_path / "out.csv"
+    export_resumes.main([str(queries), str(output)])
+    export_resumes.main([str(queries), str(output), "--resume"])
+
+    with open(output, encoding="utf-8", newline="") as f:
+        rows = list(csv.reader(f))
+    assert rows[0] == export_resumes.FIELDS
+    assert rows.count(export_resumes.FIELDS) == 1
+    assert len(rows) == 5
+
+
+def test_parquet_fresh_export_clears_old_parts(queries, tmp_path):
+    pytest.importorskip("pyarrow")
+    import pyarrow.parquet as pq
+
+    output = tmp_path / "out"
+    output.mkdir()
+    (output / "part-000099.parquet").write_bytes(b"old export")
+    (output / "part-000001.parquet.tmp").write_bytes(b"crashed write")
+
+    export_resumes.main([str(queries), str(output), "--format", "parquet"])
+
+    assert sorted(p.name for p in output.iterdir()) == [
+        "part-000001.parquet",
+        "part-000002.parquet",
+    ]
+    assert pq.read_table(output / "part-000002.parquet").num_rows == 2
@@ -0,0 +1,294 @@
+import json
+import random
+import time
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+from hypothesis import given, settings
+from hypothesis import strategies as st
+
+from query_plan import (
+    WORK_UA_SALARY_BOUNDS,
+    WORK_UA_SALARY_IDS,
+    InvalidQueryError,
+    _plan_query,
+    lookup_buckets,
+    parse_range,
+    parse_salary_range,
+    plan_query,
+    robota_ua_experience_codes,
+    work_ua_experience_codes,
+    work_ua_salary_ids,
+)
+
+
+# Beyond this many years every year maps to the last bucket of both sites
+MAX_YEAR = 20
+
+
+def work_ua_year_code(year):
+    # Year-by-year mapping used by the original parser
+    return {0: 0, 1: 1, 2: 164, 3: 165, 4: 165, 5: 165}.get(year, 166)
+
+
+def robota_ua_year_code(year):
+    if year < 1:
+        return "0"
+    if year < 2:
+        return "1"
+    if year < 5:
+        return "3"
+    if year < 10:
+        return "4"
+    # 10 years counts as "More than 10 years" for single values and ranges alike
+    return "5"
+
+
+def brute_force_codes(year_code, start, end):
+    # Walk the range year by year; open-ended ranges run to the last bucket
+    last = max(start, MAX_YEAR) if end is None else end
+    return tuple(dict.fromkeys(year_code(year) for year in range(start, last + 1)))
+
+
+def brute_force_salary_ids(start, end):
+    # Lower bound rounds down, upper bound rounds up to the nearest threshold
+    start_id = 0
+    for bound, salary_id in zip(WORK_UA_SALARY_BOUNDS, WORK_UA_SALARY_IDS):
+        if bound <= start:
+            start_id = salary_id
+    end_id = 0
+    if end is not None:
+        for bound, salary_id in zip(WORK_UA_SALARY_BOUNDS, WORK_UA_SALARY_IDS):
+            if bound >= end:
+                end_id = salary_id
+                break
+    return start_id, end_id
+
+
+years = st.integers(min_value=0, max_value=60)
+ranges = st.tuples(years, years).map(sorted).map(tuple)
+salaries = st.integers(min_value=0, max_value=300000)
+
+
+@settings(max_examples=2000)
+@given(ranges)
+def test_work_ua_experience_codes_match_brute_force(year_range):
+    start, end = year_range
+    assert work_ua_experience_codes(start, end) == brute_force_codes(
+        work_ua_year_code, start, end
+    )
+
+
+@settings(max_examples=2000)
+@given(ranges)
+def test_robota_ua_experience_codes_match_brute_force(year_range):
+    start, end = year_range
+    assert robota_ua_experience_codes(start, end) == brute_force_codes(
+        robota_ua_year_code, start, end
+    )
+
+
+@given(years)
+def test_open_ended_experience_covers_all_later_buckets(start):
+    assert work_ua_experience_codes(start, None) == brute_force_codes(
+        work_ua_year_code, start, None
+    )
+    assert robota_ua_experience_codes(start, None) == brute_force_codes(
+        robota_ua_year_code, start, None
+    )
+
+
+@given(years, st.sampled_from(["+", "-", " +", "- "]))
+def test_open_ended_inputs_in_plans(start, suffix):
+    experience = f"{start}{suffix}"
+    assert parse_range(experience) == (start, None)
+
+    work_ua = plan_query("work_ua", "python", experience=experience)
+    robota_ua = plan_query("robota_ua", "python", experience=experience)
+
+    assert work_ua.experience_codes == brute_force_codes(
+        work_ua_year_code, start, None
+    )
+    assert robota_ua.experience_codes == brute_force_codes(
+        robota_ua_year_code, start, None
+    )
+
+
+@given(st.integers(min_value=0, max_value=10**12), st.integers(min_value=0))
+def test_huge_ranges_behave_like_open_ended(start, length):
+    start = min(start, MAX_YEAR)
+    end = start + MAX_YEAR + length
+    assert work_ua_experience_codes(start, end) == work_ua_experience_codes(
+        start, None
+    )
+    assert robota_ua_experience_codes(start, end) == robota_ua_experience_codes(
+        start, None
+    )
+
+
+@settings(max_examples=2000)
+@given(salaries, st.one_of(st.none(), salaries))
+def test_work_ua_salary_ids_match_brute_force(start, end):
+    assert work_ua_salary_ids(start, end) == brute_force_salary_ids(start, end)
+
+
+@given(st.lists(st.integers(min_value=-5, max_value=50), min_size=1, unique=True))
+def test_lookup_buckets_returns_contiguous_codes(bounds):
+    bounds = tuple(sorted(bounds))
+    codes = tuple(range(len(bounds)))
+    start, end = bounds[0], bounds[-1] + 1
+
+    assert lookup_buckets(bounds, codes, start, end) == codes
+    assert lookup_buckets(bounds, codes, end, None) == codes[-1:]
+
+
+@pytest.mark.parametrize(
+    "experience, expected",
+    [
+        ("10", ("5",)),
+        ("10-12", ("5",)),
+        ("9-10", ("4", "5")),
+        ("5-9", ("4",)),
+        ("5-10", ("4", "5")),
+    ],
+)
+def test_robota_ua_ten_years_boundary(experience, expected):
+    plan = plan_query("robota_ua", "python", experience=experience)
+
+    assert plan.experience_codes == expected
+
+
+@pytest.mark.parametrize(
+    "salary, expected",
+    [
+        # Values between thresholds round to the enclosing bucket
+        ("25000-45000", (4, 7)),
+        ("20000-50000", (4, 7)),
+        ("19999-100001", (0, 0)),
+        # A single value is a lower limit
+        ("20000", (4, 0)),
+        ("20 000", (4, 0)),
+        ("35000", (5, 0)),
+    ],
+)
+def test_work_ua_salary_rounding_boundaries(salary, expected):
+    plan = plan_query("work_ua", "python", salary=salary)
+
+    assert plan.salary_ids == expected
+    query = parse_qs(urlparse(plan.url).query)
+    assert query.get("salaryfrom") == ([str(expected[0])] if expected[0] else None)
+    assert query.get("salaryto") == ([str(expected[1])] if expected[1] else None)
+
+
+@given(salaries, st.one_of(st.none(), salaries))
+def test_salary_fields_are_kept_apart(start, end):
+    if end is not None and end < start:
+        start, end = end, start
+    salary = str(start) if end is None else f"{start}-{end}"
+    expected_uah = parse_salary_range(salary)
+
+    work_ua = plan_query("work_ua", "python", salary=salary)
+    robota_ua = plan_query("robota_ua", "python", salary=salary)
+
+    assert work_ua.salary_uah == expected_uah
+    assert work_ua.salary_ids == work_ua_salary_ids(*expected_uah)
+    assert robota_ua.salary_uah == expected_uah
+    assert robota_ua.salary_ids is None
+    salary_filter = json.loads(parse_qs(urlparse(robota_ua.url).query)["salary"][0])
+    assert salary_filter == {"from": expected_uah[0], "to": expected_uah[1]}
+
+
+@pytest.mark.parametrize("salary", ["20 000", " 20000 ", "20000+"])
+def test_single_salary_has_no_upper_limit(salary):
+    assert parse_salary_range(salary) == (20000, None)
+
+
+@pytest.mark.parametrize(
+    "filters",
+    [
+        {"salary": "20000 грн"},
+        {"salary": "50000-20000"},
+        {"experience": "2-5 years"},
+        {"experience": "abc"},
+    ],
+)
+def test_unreadable_filters_are_invalid(filters):
+    for site in ("work_ua", "robota_ua"):
+        with pytest.raises(InvalidQueryError):
+            plan_query(site, "python", **filters)
+
+
+def test_unsupported_site_is_invalid():
+    with pytest.raises(InvalidQueryError):
+        plan_query("work.ua", "python")
+
+
+def test_million_generated_inputs_match_brute_force():
+    # Every year past MAX_YEAR maps like MAX_YEAR, so the oracle can be tabulated
+    work_ua_table = {
+        (start, end): brute_force_codes(work_ua_year_code, start, end)
+        for start in range(MAX_YEAR + 1)
+        for end in range(start, MAX_YEAR + 1)
+    }
+    robota_ua_table = {
+        (start, end): brute_force_codes(robota_ua_year_code, start, end)
+        for start in range(MAX_YEAR + 1)
+        for end in range(start, MAX_YEAR + 1)
+    }
+
+    rng = random.Random(2024)
+    for _ in range(1_000_000):
+        start = rng.randrange(40)
+        width = rng.randrange(10**9) if rng.random() < 0.1 else rng.randrange(15)
+        end = start + width
+        key = (min(start, MAX_YEAR), min(end, MAX_YEAR))
+        assert work_ua_experience_codes(start, end) == work_ua_table[key]
+        assert robota_ua_experience_codes(start, end) == robota_ua_table[key]
+
+
+@pytest.mark.benchmark
+def test_experience_lookup_speed_does_not_depend_on_range_width():
+    rng = random.Random(2024)
+    narrow = [(start, start + rng.randrange(15)) for start in range(100_000)]
+    wide = [(start, start + 10**9) for start in range(100_000)]
+
+    timings = []
+    for ranges in (narrow, wide):
+        started = time.perf_counter()
+        for start, end in ranges:
+            work_ua_experience_codes(start, end)
+            robota_ua_experience_codes(start, end)
+        timings.append(time.perf_counter() - started)
+
+    # Interval lookups are not walked year by year
+    assert timings[1] < timings[0] * 3
+
+
+@pytest.mark.benchmark
+def test_plan_query_speed():
+    _plan_query.cache_clear()
+    rng = random.Random(7)
+    queries = [
+        (
+            rng.choice(["work_ua", "robota_ua"]),
+            f"developer {i}",
+            rng.choice([None, "kyiv", "lviv"]),
+            f"{rng.randrange(20)}-{rng.randrange(20, 10**9)}",
+            f"{rng.randrange(10000, 50000)}-{rng.randrange(50000, 200000)}",
+        )
+        for i in range(20000)
+    ]
+
+    started = time.perf_counter()
+    for query in queries:
+        plan_query(*query)
+    uncached = (time.perf_counter() - started) / len(queries)
+
+    started = time.perf_counter()
+    for _ in range(len(queries)):
+        plan_query(*queries[0])
+    cached = (time.perf_counter() - started) / len(queries)
+
+    # Huge experience ranges must not be walked year by year
+    assert uncached < 200e-6
+    assert cached < uncached
@@ -0,0 +1,241 @@
+import asyncio
+import os
+import threading
+import time
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import httpx
+import pytest
+
+import resume_enricher
+import resume_parser
+from resume_enricher import (
+    _fetch_details,
+    enrich_resumes,
+    is_enrichable,
+    parse_resume_details,
+)
+
+
+FIXTURES = os.path.join(os.path.dirname(__file__), "fixtures")
+
+
+@pytest.fixture
+def work_ua_page():
+    with open(os.path.join(FIXTURES, "work_ua_resume.html"), encoding="utf-8") as f:
+        return f.read()
+
+
+def test_parse_resume_details_skills(work_ua_page):
+    details = parse_resume_details(work_ua_page)
+
+    assert details["skills"] == ["Python", "Django", "PostgreSQL"]
+
+
+def test_parse_resume_details_experience_groups_positions(work_ua_page):
+    details = parse_resume_details(work_ua_page)
+
+    assert len(details["experience"]) == 2
+    assert details["experience"][0].startswith("Python Developer, з 03.2021")
+    assert "SoftServe" in details["experience"][0]
+    assert details["experience"][1].startswith("Junior Python Developer")
+    assert "EPAM" in details["experience"][1]
+
+
+def test_parse_resume_details_education(work_ua_page):
+    details = parse_resume_details(work_ua_page)
+
+    assert len(details["education"]) == 1
+    assert details["education"][0].startswith("КПІ ім. Ігоря Сікорського")
+    # The next section is not part of the education entry
+    assert "Англійська" not in details["education"][0]
+
+
+def test_parse_resume_details_skills_from_section_without_tags():
+    page = """
+    <html><body>
+      <h2>Знання і навички</h2>
+      <p>Python, SQL</p>
+      <h2>Освіта</h2>
+      <p>КПІ</p>
+    </body></html>
+    """
+    details = parse_resume_details(page)
+
+    assert details["skills"] == ["Python, SQL"]
+    assert details["education"] == ["КПІ"]
+
+
+def test_parse_resume_details_empty_page():
+    details = parse_resume_details("<html><body><div id='app'></div></body></html>")
+
+    assert details == {"skills": [], "experience": [], "education": []}
+
+
+@pytest.mark.parametrize(
+    "link, expected",
+    [
+        ("https://www.work.ua/resumes/1234567/", True),
+        ("https://robota.ua/candidates/12345", False),
+        (None, False),
+    ],
+)
+def test_is_enrichable(link, expected):
+    assert is_enrichable(link) is expected
+
+
+def test_enrich_resumes_skips_robota_ua():
+    candidates = [{"title": "QA", "link": "https://robota.ua/candidates/12345"}]
+
+    enriched = asyncio.run(enrich_resumes(candidates))
+
+    assert enriched == [{**candidates[0], "details": None}]
+
+
+def test_details_cache_is_bounded(monkeypatch):
+    monkeypatch.setattr(resume_enricher, "CACHE_SIZE", 3)
+    monkeypatch.setattr(resume_enricher, "_details_cache", OrderedDict())
+
+    for i in range(5):
+        resume_enricher._cache_put(f"link-{i}", {"details": i})
+    # Reading an entry keeps it from being evicted next
+    resume_enricher._cache_get("link-2")
+    resume_enricher._cache_put("link-5", {"details": 5})
+
+    assert list(resume_enricher._details_cache) == ["link-4", "link-2", "link-5"]
+
+
+ETAG = '"v1"'
+LAST_MODIFIED = "Mon, 06 Jan 2025 10:00:00 GMT"
+
+
+class FakeWorkUa(BaseHTTPRequestHandler):
+    """
+    Serves the saved resume page with an ETag and Last-Modified, answering
+    304 to matching conditional requests. Paths starting with /error fail.
+    """
+
+    page = b""
+    delay = 0
+    requests = []
+    in_flight = 0
+    max_in_flight = 0
+    lock = threading.Lock()
+
+    def do_GET(self):
+        cls = type(self)
+        with cls.lock:
+            cls.requests.append((self.path, dict(self.headers)))
+            cls.in_flight += 1
+            cls.max_in_flight = max(cls.max_in_flight, cls.in_flight)
+        try:
+            time.sleep(cls.delay)
+            if self.path.startswith("/error"):
+                self.send_response(500)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+            elif self.headers.get("If-None-Match") == ETAG:
+                self.send_response(304)
+                self.end_headers()
+            else:
+                self.send_response(200)
+                self.send_header("Content-Type", "text/html; charset=utf-8")
+                self.send_header("Content-Length", str(len(cls.page)))
+                self.send_header("ETag", ETAG)
+                self.send_header("Last-Modified", LAST_MODIFIED)
+                self.end_headers()
+                self.wfile.write(cls.page)
+        finally:
+            with cls.lock:
+                cls.in_flight -= 1
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def work_ua(work_ua_page, monkeypatch):
+    monkeypatch.setattr(resume_enricher, "_details_cache", OrderedDict())
+    # Let the local server stand in for work.ua
+    monkeypatch.setattr(resume_enricher, "ENRICHABLE_HOSTS", ("127.0.0.1",))
+    FakeWorkUa.page = work_ua_page.encode("utf-8")
+    FakeWorkUa.delay = 0
+    FakeWorkUa.requests = []
+    FakeWorkUa.in_flight = FakeWorkUa.max_in_flight = 0
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FakeWorkUa)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}"
+
+    server.shutdown()
+    server.server_close()
+
+
+def fetch(link):
+    async def run():
+        async with httpx.AsyncClient() as client:
+            return await _fetch_details(client, asyncio.Semaphore(1), link)
+
+    return asyncio.run(run())
+
+
+def test_fetch_details_revalidates_cached_page(work_ua):
+    link = f"{work_ua}/resumes/1/"
+
+    first = fetch(link)
+    # The page is not parsed again on 304, the cached details are returned
+    resume_enricher._details_cache[link]["details"]["skills"].append("cached")
+    second = fetch(link)
+
+    assert first["skills"][:3] == ["Python", "Django", "PostgreSQL"]
+    assert second["skills"][-1] == "cached"
+    first_headers, second_headers = (headers for path, headers in FakeWorkUa.requests)
+    assert "If-None-Match" not in first_headers
+    assert second_headers["If-None-Match"] == ETAG
+    assert second_headers["If-Modified-Since"] == LAST_MODIFIED
+
+
+def test_fetch_details_falls_back_to_cache_on_errors(work_ua):
+    details = {"skills": ["Python"], "experience": [], "education": []}
+    entry = {"etag": None, "last_modified": None, "details": details}
+
+    # Non-200 response
+    resume_enricher._cache_put(f"{work_ua}/error/1/", entry)
+    assert fetch(f"{work_ua}/error/1/") == details
+    assert fetch(f"{work_ua}/error/2/") is None
+
+    # Connection error: nothing listens on the discard port
+    resume_enricher._cache_put("http://127.0.0.1:9/resumes/1/", entry)
+    assert fetch("http://127.0.0.1:9/resumes/1/") == details
+    assert fetch("http://127.0.0.1:9/resumes/2/") is None
+
+
+def test_enrich_resumes_bounds_concurrency(work_ua):
+    FakeWorkUa.delay = 0.05
+    candidates = [{"link": f"{work_ua}/resumes/{i}/"} for i in range(8)]
+
+    enriched = asyncio.run(enrich_resumes(candidates, max_concurrency=2))
+
+    assert all(candidate["details"]["skills"] for candidate in enriched)
+    assert len(FakeWorkUa.requests) == 8
+    assert FakeWorkUa.max_in_flight <= 2
+
+
+def test_enrich_top_candidates_fetches_only_top_n(work_ua):
+    candidates = [
+        {"title": "Python Developer", "link": f"{work_ua}/resumes/{i}/", "score": 10 - i}
+        for i in range(5)
+    ]
+
+    enriched = resume_parser.enrich_top_candidates(candidates, "Python Developer", 2)
+
+    assert sorted(path for path, headers in FakeWorkUa.requests) == [
+        "/resumes/0/",
+        "/resumes/1/",
+    ]
+    assert [candidate["link"] for candidate in enriched[2:]] == [
+        candidate["link"] for candidate in candidates[2:]
+    ]
+    assert all("details" not in candidate for candidate in enriched[2:])
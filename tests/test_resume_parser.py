@@ -0,0 +1,344 @@
+import pytest
+from selenium.common.exceptions import (
+    NoSuchElementException,
+    TimeoutException,
+    WebDriverException,
+)
+from selenium.webdriver.support.ui import WebDriverWait
+
+import resume_parser
+from query_plan import InvalidQueryError
+from resume_parser import (
+    CircuitBreaker,
+    DriverError,
+    ResumeParser,
+    SiteError,
+    SiteUnavailableError,
+)
+
+
+class FakeElement:
+    def __init__(self, text, href=None):
+        self.text = text
+        self.href = href
+
+    def get_attribute(self, name):
+        return self.href
+
+
+class FakeCard:
+    def __init__(self, title, driver):
+        self.title = title
+        self.driver = driver
+
+    def find_element(self, by, selector):
+        if not self.driver.alive:
+            raise WebDriverException("chrome not reachable")
+        if selector == "h2 a":
+            link = f"https://www.work.ua/resumes/{self.title}/"
+            return FakeElement(self.title, link)
+        raise NoSuchElementException(selector)
+
+
+class FakeDriver:
+    """
+    Chrome stand-in. `page` is "cards", "empty" or "error"; `get_error` is
+    raised by get(); `crash_on_parse` kills the browser once cards are read.
+    """
+
+    def __init__(
+        self, page="cards", get_error=None, alive=True, crash_on_parse=False
+    ):
+        self.page = page
+        self.get_error = get_error
+        self.alive = alive
+        self.crash_on_parse = crash_on_parse
+        self.quit_called = False
+
+    def get(self, url):
+        if self.get_error:
+            raise self.get_error
+
+    def execute_script(self, script):
+        if not self.alive:
+            raise WebDriverException("chrome not reachable")
+        return "complete"
+
+    def find_element(self, by, selector):
+        if not self.alive:
+            raise WebDriverException("chrome not reachable")
+        if by == "xpath" and self.page == "empty":
+            return FakeElement("Резюме не знайдено")
+        if by == "css selector" and self.page == "cards":
+            return FakeElement("")
+        raise NoSuchElementException(selector)
+
+    def find_elements(self, by, selector):
+        if self.page != "cards":
+            return []
+        if self.crash_on_parse:
+            self.alive = False
+        return [FakeCard("python-developer", self), FakeCard("qa", self)]
+
+    def quit(self):
+        self.quit_called = True
+
+
+@pytest.fixture
+def make_parser(monkeypatch):
+    # Do not wait 20 seconds for elements that never appear
+    monkeypatch.setattr(
+        resume_parser,
+        "WebDriverWait",
+        lambda driver, timeout: WebDriverWait(driver, 0.1, poll_frequency=0.01),
+    )
+    monkeypatch.setattr(
+        resume_parser,
+        "_driver_metrics",
+        {"driver_failures": 0, "driver_restarts": 0},
+    )
+
+    def make(*drivers):
+        parser = ResumeParser.__new__(ResumeParser)
+        parser.driver = drivers[0]
+        replacements = iter(drivers[1:])
+        parser._start_driver = lambda: next(replacements)
+        return parser
+
+    return make
+
+
+def test_cards_are_parsed(make_parser):
+    parser = make_parser(FakeDriver())
+
+    resumes = parser.parse_work_ua("Python Developer")
+
+    assert [resume["title"] for resume in resumes] == ["python-developer", "qa"]
+    assert resume_parser.get_metrics()["driver_restarts"] == 0
+
+
+def test_no_results_marker_is_an_empty_result(make_parser):
+    parser = make_parser(FakeDriver(page="empty"))
+
+    assert parser.parse_work_ua("Python Developer") == []
+
+
+@pytest.mark.parametrize(
+    "driver",
+    [
+        # Error page or captcha: neither cards nor the "no results" message
+        FakeDriver(page="error"),
+        # Page load timeout on a responsive browser: the site is slow or down
+        FakeDriver(get_error=TimeoutException("timeout: Timed out receiving message")),
+        FakeDriver(get_error=WebDriverException("net::ERR_NAME_NOT_RESOLVED")),
+    ],
+)
+def test_site_failures_do_not_restart_the_driver(make_parser, driver):
+    parser = make_parser(driver)
+
+    with pytest.raises(SiteError):
+        parser.parse_work_ua("Python Developer")
+
+    metrics = resume_parser.get_metrics()
+    assert metrics["driver_failures"] == 0
+    assert metrics["driver_restarts"] == 0
+    assert not driver.quit_called
+
+
+def test_error_text_leaves_out_chromedriver_stacktrace(make_parser):
+    error = WebDriverException(
+        "unknown error: net::ERR_NAME_NOT_RESOLVED",
+        stacktrace=["#0 0x55d4c1e2 <unknown>", "#1 0x55d4c1f0 <unknown>"],
+    )
+    parser = make_parser(FakeDriver(get_error=error))
+
+    with pytest.raises(SiteError) as excinfo:
+        parser.parse_work_ua("Python Developer")
+
+    assert "ERR_NAME_NOT_RESOLVED" in str(excinfo.value)
+    assert "Stacktrace" not in str(excinfo.value)
+    assert "<unknown>" not in str(excinfo.value)
+
+
+def test_crashed_driver_is_restarted_and_page_retried(make_parser):
+    crashed = FakeDriver(get_error=WebDriverException("tab crashed"), alive=False)
+    parser = make_parser(crashed, FakeDriver())
+
+    resumes = parser.parse_work_ua("Python Developer")
+
+    assert len(resumes) == 2
+    assert crashed.quit_called
+    metrics = resume_parser.get_metrics()
+    assert metrics["driver_failures"] == 1
+    assert metrics["driver_restarts"] == 1
+
+
+def test_crash_while_parsing_cards_is_retried(make_parser):
+    parser = make_parser(FakeDriver(crash_on_parse=True), FakeDriver())
+
+    resumes = parser.parse_work_ua("Python Developer")
+
+    assert len(resumes) == 2
+    assert resume_parser.get_metrics()["driver_restarts"] == 1
+
+
+def test_driver_error_after_restart(make_parser):
+    parser = make_parser(
+        FakeDriver(get_error=WebDriverException("tab crashed"), alive=False),
+        FakeDriver(get_error=WebDriverException("tab crashed"), alive=False),
+    )
+
+    with pytest.raises(DriverError):
+        parser.parse_work_ua("Python Developer")
+
+    assert resume_parser.get_metrics()["driver_restarts"] == 1
+
+
+def test_circuit_breaker_opens_and_half_opens(monkeypatch):
+    now = [0.0]
+    monkeypatch.setattr(resume_parser.time, "monotonic", lambda: now[0])
+    breaker = CircuitBreaker("work_ua", failure_threshold=2, reset_timeout=60)
+
+    breaker.record_failure()
+    assert breaker.state == "closed"
+    breaker.record_failure()
+    assert breaker.state == "open"
+    assert not breaker.allow_request()
+
+    now[0] = 61
+    assert breaker.state == "half_open"
+    assert breaker.allow_request()
+    # Only one trial request at a time
+    assert not breaker.allow_request()
+
+    breaker.record_success()
+    assert breaker.state == "closed"
+    assert breaker.metrics()["total_rejected"] == 2
+
+
+class FakeSites:
+    def __init__(self):
+        self.calls = []
+        # Error raised by each site, None to return one resume
+        self.errors = {
+            "work_ua": SiteError("503 Service Unavailable"),
+            "robota_ua": None,
+        }
+        # Sites that have no matching resumes
+        self.empty = set()
+
+    def parse(self, site, job_position):
+        self.calls.append((site, job_position))
+        if self.errors[site]:
+            raise self.errors[site]
+        if site in self.empty:
+            return []
+        return [
+            {
+                "title": job_position,
+                "salary": None,
+                "personal_info": "Іван, 28 років",
+                "location": "Київ",
+                "link": f"https://{site}.example/resumes/1/",
+            }
+        ]
+
+
+@pytest.fixture
+def fake_sites(monkeypatch):
+    sites = FakeSites()
+
+    class FakeParser:
+        def __init__(self, driver_path):
+            pass
+
+        def parse_work_ua(self, job_position, **kwargs):
+            return sites.parse("work_ua", job_position)
+
+        def parse_robota_ua(self, job_position, **kwargs):
+            return sites.parse("robota_ua", job_position)
+
+        def close(self):
+            pass
+
+    monkeypatch.setattr(resume_parser, "ResumeParser", FakeParser)
+    monkeypatch.setattr(resume_parser, "get_usd_rate_nbu", lambda: 41.0)
+    monkeypatch.setattr(
+        resume_parser,
+        "CIRCUIT_BREAKERS",
+        {
+            "work_ua": CircuitBreaker("work_ua", failure_threshold=2),
+            "robota_ua": CircuitBreaker("robota_ua", failure_threshold=2),
+        },
+    )
+    return sites
+
+
+def test_fetch_resumes_fails_fast_while_site_is_down(fake_sites):
+    for _ in range(2):
+        with pytest.raises(SiteError):
+            resume_parser.fetch_resumes("work_ua", "Python Developer")
+
+    with pytest.raises(SiteUnavailableError):
+        resume_parser.fetch_resumes("work_ua", "Python Developer")
+
+    assert len(fake_sites.calls) == 2
+    assert resume_parser.get_metrics()["circuit_breakers"]["work_ua"]["state"] == "open"
+
+
+@pytest.mark.parametrize(
+    "site, filters",
+    [
+        ("work_ua", {"experience": "abc"}),
+        ("work_ua", {"salary": "20000 грн"}),
+        ("all", {"salary": "from 20000"}),
+        ("work.ua", {}),
+    ],
+)
+def test_invalid_filters_are_reported(fake_sites, site, filters):
+    for _ in range(3):
+        with pytest.raises(InvalidQueryError):
+            resume_parser.fetch_resumes(site, "Python", **filters)
+
+    # Invalid filters are not site failures
+    assert resume_parser.CIRCUIT_BREAKERS["work_ua"].state == "closed"
+    assert fake_sites.calls == []
+
+
+def test_driver_errors_do_not_open_the_breaker(fake_sites):
+    fake_sites.errors["work_ua"] = DriverError("Browser stopped responding")
+
+    for _ in range(3):
+        with pytest.raises(DriverError):
+            resume_parser.fetch_resumes("work_ua", "Python Developer")
+
+    assert len(fake_sites.calls) == 3
+    metrics = resume_parser.CIRCUIT_BREAKERS["work_ua"].metrics()
+    assert metrics["state"] == "closed"
+    assert metrics["total_failures"] == 0
+
+
+def test_all_reports_the_skipped_site(fake_sites):
+    resumes = resume_parser.fetch_resumes("all", "Python Developer")
+
+    assert [resume["link"] for resume in resumes] == [
+        "https://robota_ua.example/resumes/1/"
+    ]
+    assert list(resumes.site_errors) == ["work_ua"]
+    assert isinstance(resumes.site_errors["work_ua"], SiteError)
+
+
+def test_all_skipped_site_with_no_other_results_is_not_empty_result(fake_sites):
+    fake_sites.empty.add("robota_ua")
+
+    resumes = resume_parser.fetch_resumes("all", "Python Developer")
+
+    assert resumes == []
+    assert list(resumes.site_errors) == ["work_ua"]
+
+
+def test_all_raises_when_both_sites_fail(fake_sites):
+    fake_sites.errors["robota_ua"] = SiteError("502 Bad Gateway")
+
+    with pytest.raises(SiteError):
+        resume_parser.fetch_resumes("all", "Python Developer")
@@ -0,0 +1,284 @@
+import json
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+import resume_parser
+from query_plan import plan_query
+from resume_parser import CircuitBreaker, ScrapingError
+from robota_api import (
+    RobotaApiError,
+    RobotaUaClient,
+    format_age,
+    parse_resume_document,
+)
+
+
+# Hand-written in the shape the client expects, not captured from robota.ua.
+# Replace them with real captured responses once the API has been checked.
+FIXTURES = os.path.join(os.path.dirname(__file__), "fixtures", "robota_ua")
+
+
+def load_fixture(name):
+    with open(os.path.join(FIXTURES, name), encoding="utf-8") as f:
+        return json.load(f)
+
+
+class FakeRobotaUa(BaseHTTPRequestHandler):
+    """
+    Serves the saved robota.ua responses. `responses` maps a path to a list of
+    pages (POST, chosen by the "page" field) or a single body (GET).
+    """
+
+    responses = {}
+    requests = []
+
+    def _reply(self, body):
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        self.requests.append(("GET", self.path, None))
+        self._reply(self.responses[self.path])
+
+    def do_POST(self):
+        length = int(self.headers["Content-Length"])
+        payload = json.loads(self.rfile.read(length))
+        self.requests.append(("POST", self.path, payload))
+        pages = self.responses[self.path]
+        self._reply(pages[payload["page"]])
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def robota_ua():
+    FakeRobotaUa.responses = {
+        "/dictionary/city": load_fixture("dictionary_city.json"),
+        "/cvdb/resumes": [
+            load_fixture("cvdb_resumes_page0.json"),
+            load_fixture("cvdb_resumes_page1.json"),
+        ],
+    }
+    FakeRobotaUa.requests = []
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FakeRobotaUa)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    url = f"http://127.0.0.1:{server.server_port}"
+
+    client = RobotaUaClient(api_url=url, dictionary_url=url, page_size=3, timeout=5)
+    yield client
+
+    client.close()
+    server.shutdown()
+    server.server_close()
+
+
+def searches():
+    return [payload for method, path, payload in FakeRobotaUa.requests if method == "POST"]
+
+
+def test_parse_resume_document_mapping():
+    page = load_fixture("cvdb_resumes_page0.json")
+
+    resumes = [parse_resume_document(document) for document in page["documents"]]
+
+    assert resumes == [
+        {
+            "title": "Python Developer",
+            "salary": "60 000 грн",
+            "personal_info": "Олександр, 29 років",
+            "location": "Київ",
+            "link": "https://robota.ua/candidates/21873465",
+        },
+        {
+            "title": "Senior Python Engineer",
+            "salary": "3 500 $",
+            "personal_info": "Марія Коваленко, 34 роки",
+            "location": "Львів",
+            "link": "https://robota.ua/candidates/20411298",
+        },
+        {
+            "title": "Backend Developer (Python/Django)",
+            "salary": None,
+            "personal_info": "Андрій, None",
+            "location": "Київ",
+            "link": "https://robota.ua/candidates/19955021",
+        },
+    ]
+
+
+@pytest.mark.parametrize(
+    "age, expected",
+    [
+        (1, "1 рік"),
+        (21, "21 рік"),
+        (11, "11 років"),
+        (22, "22 роки"),
+        (34, "34 роки"),
+        (12, "12 років"),
+        (14, "14 років"),
+        (25, "25 років"),
+        (40, "40 років"),
+        (111, "111 років"),
+    ],
+)
+def test_format_age(age, expected):
+    assert format_age(age) == expected
+
+
+def test_search_pages_until_short_page(robota_ua):
+    plan = plan_query("robota_ua", "Python", "Kyiv", "2-5", "20000-50000")
+
+    resumes = robota_ua.search(plan, "Python", location="Kyiv", max_results=100)
+
+    assert len(resumes) == 5
+    assert resumes[3]["link"] == "https://robota.ua/candidates/18700342"
+    assert [payload["page"] for payload in searches()] == [0, 1]
+
+    payload = searches()[0]
+    assert payload["keyWords"] == "Python"
+    assert payload["cityId"] == 1
+    assert payload["experienceIds"] == ["3", "4"]
+    assert payload["salary"] == {"from": 20000, "to": 50000}
+    assert payload["showCvWithoutSalary"] is False
+    assert payload["count"] == 3
+
+
+def test_search_stops_at_total(robota_ua):
+    FakeRobotaUa.responses["/cvdb/resumes"][0]["total"] = 3
+    plan = plan_query("robota_ua", "Python")
+
+    resumes = robota_ua.search(plan, "Python")
+
+    assert len(resumes) == 3
+    assert [payload["page"] for payload in searches()] == [0]
+    assert searches()[0]["salary"] == {"from": 0, "to": 0}
+    assert searches()[0]["showCvWithoutSalary"] is True
+
+
+def test_search_stops_at_max_results(robota_ua):
+    plan = plan_query("robota_ua", "Python")
+
+    resumes = robota_ua.search(plan, "Python", max_results=2)
+
+    assert len(resumes) == 2
+    assert [payload["count"] for payload in searches()] == [2]
+
+
+def test_city_dictionary_is_loaded_once(robota_ua):
+    assert robota_ua.get_city_id("Lviv") == 21
+    assert robota_ua.get_city_id("Львів") == 21
+    assert robota_ua.get_city_id("odesa") == 4
+
+    gets = [path for method, path, payload in FakeRobotaUa.requests if method == "GET"]
+    assert gets == ["/dictionary/city"]
+
+
+def test_unknown_city_searches_all_of_ukraine(robota_ua, capsys):
+    plan = plan_query("robota_ua", "Python", "Atlantis")
+
+    robota_ua.search(plan, "Python", location="Atlantis")
+
+    assert searches()[0]["cityId"] == 0
+    assert "Unknown robota.ua city 'Atlantis'" in capsys.readouterr().out
+
+
+def test_malformed_city_dictionary_is_not_cached(robota_ua):
+    cities = load_fixture("dictionary_city.json")
+    # A city without an ID after others have been read
+    FakeRobotaUa.responses["/dictionary/city"] = cities + [{"en": "Kharkiv"}]
+
+    with pytest.raises(RobotaApiError):
+        robota_ua.get_city_id("Kyiv")
+    assert robota_ua._city_ids is None
+
+    FakeRobotaUa.responses["/dictionary/city"] = cities
+    assert robota_ua.get_city_id("Kyiv") == 1
+
+
+@pytest.mark.parametrize(
+    "page",
+    [
+        [],
+        {"documents": ["21873465"], "total": 1},
+        {"documents": [{"speciality": 42}], "total": 1},
+        {"documents": {"resumeId": 1}, "total": 1},
+        {"documents": [{"resumeId": i} for i in range(3)], "total": "many"},
+    ],
+)
+def test_malformed_search_response_raises_api_error(robota_ua, page):
+    FakeRobotaUa.responses["/cvdb/resumes"] = [page]
+    plan = plan_query("robota_ua", "Python")
+
+    with pytest.raises(RobotaApiError):
+        robota_ua.search(plan, "Python")
+
+
+@pytest.fixture
+def api_engine(robota_ua, monkeypatch):
+    class FakeParser:
+        def __init__(self, driver_path):
+            pass
+
+        def parse_work_ua(self, job_position, **kwargs):
+            return [
+                {
+                    "title": job_position,
+                    "salary": "40 000 грн",
+                    "personal_info": "Іван, 28 років",
+                    "location": "Київ",
+                    "link": "https://www.work.ua/resumes/1/",
+                }
+            ]
+
+        def parse_robota_ua(self, job_position, **kwargs):
+            raise AssertionError("robota.ua must be searched through the API")
+
+        def close(self):
+            pass
+
+    monkeypatch.setattr(resume_parser, "ResumeParser", FakeParser)
+    monkeypatch.setattr(resume_parser, "_robota_client", robota_ua)
+    # Scoring converts dollar salaries at the NBU rate
+    monkeypatch.setattr(resume_parser, "get_usd_rate_nbu", lambda: 41.0)
+    monkeypatch.setattr(
+        resume_parser,
+        "CIRCUIT_BREAKERS",
+        {
+            "work_ua": CircuitBreaker("work_ua"),
+            "robota_ua": CircuitBreaker("robota_ua"),
+        },
+    )
+    return robota_ua
+
+
+def test_fetch_resumes_through_api(api_engine):
+    resumes = resume_parser.fetch_resumes(
+        "robota_ua", "Python Developer", robota_engine="api"
+    )
+
+    assert len(resumes) == 5
+    assert all(resume["link"].startswith("https://robota.ua/") for resume in resumes)
+
+
+def test_fetch_resumes_keeps_work_ua_when_api_fails(api_engine):
+    FakeRobotaUa.responses["/cvdb/resumes"] = [{"documents": [None], "total": 1}]
+
+    resumes = resume_parser.fetch_resumes(
+        "all", "Python Developer", robota_engine="api"
+    )
+
+    assert [resume["link"] for resume in resumes] == ["https://www.work.ua/resumes/1/"]
+    assert resume_parser.CIRCUIT_BREAKERS["robota_ua"].metrics()["total_failures"] == 1
+
+    with pytest.raises(ScrapingError):
+        resume_parser.fetch_resumes("robota_ua", "Python Developer", robota_engine="api")